@@ -87,6 +87,14 @@ CREATE TABLE stock_prediction_result (
     PRIMARY KEY (stock_id, predict_day)
 );
 
+-- 종목별 예측 입력 지문 (입력 시퀀스 + 스케일러 min/max + 모델 버전 해시), 바뀐 종목만 다시 예측
+CREATE TABLE stock_prediction_fingerprint (
+    stock_id INT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
 
 -- 3. stock_recommendation: 유사 종목 추천
 CREATE TABLE stock_recommendation (
@@ -213,6 +221,15 @@ CREATE TABLE news_classification (
     PRIMARY KEY (news_id, category)
 );
 
+-- 3-1. 뉴스 분류 작업 선점 (src/scripts/classify_news.py 워커)
+CREATE TABLE news_classification_claim (
+    news_id INTEGER PRIMARY KEY REFERENCES news_raw(id) ON DELETE CASCADE,
+    worker_id TEXT NOT NULL,                -- 호스트명:pid
+    claimed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL           -- 지나면 다른 워커가 가져갈 수 있음
+);
+CREATE INDEX idx_news_classification_claim_worker ON news_classification_claim (worker_id);
+
 -- 4. 뉴스 요약
 CREATE TABLE news_summary (
     news_id INTEGER REFERENCES news_raw(id) ON DELETE CASCADE,
@@ -1,15 +1,17 @@
 import os
+import sys
 import psycopg2
-import google.generativeai as genai
 from dotenv import load_dotenv
 import re
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.llm_client import create_gemini_client
 
 # 환경변수 로드
 load_dotenv()
 
-# Gemini 설정
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel('gemini-1.5-flash')
+# Gemini 설정 (속도 제한/재시도, 뉴스 분류와 같은 응답 캐시 사용)
+llm_client = create_gemini_client('gemini-1.5-flash')
 
 # PostgreSQL 연결
 conn = psycopg2.connect(
@@ -48,8 +50,7 @@ def generate_and_store_catchphrases(stock_id):
     """
 
     try:
-        response = model.generate_content(prompt)
-        text = response.text
+        text = llm_client.generate(prompt)
     except Exception as e:
         print(f"❌ Gemini 호출 실패 (stock_id={stock_id}):", e)
         return
@@ -89,4 +90,5 @@ for (stock_id,) in top_stocks:
 
 cursor.close()
 conn.close()
+llm_client.close()
 print("✅ 모든 캐치프레이즈 생성 및 저장 완료")
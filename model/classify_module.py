@@ -1,33 +1,26 @@
 import os
-import joblib
-import psycopg2
-import pandas as pd
-import numpy as np    
-from transformers import AutoTokenizer, AutoModel
-import torch
 import re
 import json
-from dotenv import load_dotenv
-import google.generativeai as genai
 import time
+import threading
+from dotenv import load_dotenv
+
+# 무거운 리소스(분류기 pickle, roberta, Gemini, DB 종목 데이터)와 라이브러리는
+# 처음 사용할 때 로딩 -> clean_text만 쓰는 스크립트는 import 비용이 거의 없음
+# 미리 올려두려면 warmup() 호출
 
 # ---------------------------
 # 0. 기본 설정
 # ---------------------------
 load_dotenv()
-device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-multi_clf = joblib.load(os.path.join(BASE_DIR, "model", "news_category_classifier.pkl"))
-mlb = joblib.load(os.path.join(BASE_DIR, "model", "multilabel_binarizer.pkl"))
-
 MODEL_NAME = 'klue/roberta-small'
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-bert = AutoModel.from_pretrained(MODEL_NAME).to(device)
-
-# Gemini 설정
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-gemini = genai.GenerativeModel("gemini-1.5-flash")
+GEMINI_MODEL_NAME = "gemini-1.5-flash"
+# LLM 백엔드 (gemini | stub), 속도 제한은 model/llm_client.py의 LLM_* 환경변수
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+# 임베딩 저장소 경로 (빈 문자열이면 저장소 사용 안 함)
+EMBEDDING_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR", os.path.join(BASE_DIR, "data", "embedding_store"))
 
 # DB 연결
 DB_CONFIG = {
@@ -38,17 +31,111 @@ DB_CONFIG = {
     "dbname": os.getenv("DB_NAME"),
 }
 
+_resources = {}
+_resource_lock = threading.RLock()
+
+def _get_resource(name, loader):
+    """리소스를 한 번만 로딩해 재사용 (스레드 안전)"""
+    if name not in _resources:
+        with _resource_lock:
+            if name not in _resources:
+                _resources[name] = loader()
+    return _resources[name]
+
+def _load_classifier():
+    import joblib
+    multi_clf = joblib.load(os.path.join(BASE_DIR, "model", "news_category_classifier.pkl"))
+    mlb = joblib.load(os.path.join(BASE_DIR, "model", "multilabel_binarizer.pkl"))
+    return multi_clf, mlb
+
+def _load_encoder():
+    import torch
+    from model.model_runtime import load_hf_model
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    # 백엔드(eager/int8/onnx)는 MODEL_BACKEND_CLASSIFIER 또는 MODEL_BACKEND로 선택
+    tokenizer, bert, backend = load_hf_model(MODEL_NAME, "feature-extraction", component="classifier", device=device)
+    if backend != "eager":
+        device = torch.device('cpu')
+    return tokenizer, bert, device
+
+def _load_gemini():
+    import google.generativeai as genai
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel(GEMINI_MODEL_NAME)
+
+def _load_llm_client():
+    from model.llm_client import LLMClient, GeminiBackend, StubBackend, limits_from_env
+    from model.llm_cache import cache_from_env
+    backend = StubBackend() if LLM_BACKEND == "stub" else GeminiBackend(get_gemini())
+    # 응답 캐시는 LLM_CACHE_* 환경변수 (db/update_stockCatchphrase.py와 같은 파일 공유)
+    return LLMClient(backend, cache=cache_from_env(), **limits_from_env())
+
 def get_stock_data():
     """DB에서 테마/업종/종목명 데이터 로드"""
+    import psycopg2
+    import pandas as pd
     conn = psycopg2.connect(**DB_CONFIG)
     df = pd.read_sql("SELECT stock_code, stock_name, themes, industry_group FROM tmp_stock", conn)
     conn.close()
     return df
 
-# 초기화 시 로딩
-df_stock = get_stock_data()
-industry_list = df_stock['industry_group'].dropna().unique().tolist()
-theme_list = sorted({theme for t in df_stock['themes'] for theme in t if isinstance(t, list)})
+def _load_stock_catalog():
+    df_stock = get_stock_data()
+    industry_list = df_stock['industry_group'].dropna().unique().tolist()
+    theme_list = sorted({theme for t in df_stock['themes'] for theme in t if isinstance(t, list)})
+    return {"df_stock": df_stock, "industry_list": industry_list, "theme_list": theme_list}
+
+def get_classifier():
+    """(multi_clf, mlb)"""
+    return _get_resource("classifier", _load_classifier)
+
+def get_encoder():
+    """(tokenizer, bert, device)"""
+    return _get_resource("encoder", _load_encoder)
+
+def get_gemini():
+    return _get_resource("gemini", _load_gemini)
+
+def get_llm_client():
+    """속도 제한/재시도가 적용된 LLM 클라이언트 (여러 스레드에서 동시에 호출 가능)"""
+    return _get_resource("llm_client", _load_llm_client)
+
+def get_stock_catalog():
+    """{"df_stock", "industry_list", "theme_list"}"""
+    return _get_resource("stock_catalog", _load_stock_catalog)
+
+_LOADERS = {
+    "classifier": get_classifier,
+    "encoder": get_encoder,
+    "gemini": get_gemini,
+    "llm_client": get_llm_client,
+    "stock_catalog": get_stock_catalog,
+    # 아래 섹션에서 정의되므로 호출 시점에 찾음
+    "stock_matcher": lambda: get_stock_matcher(),
+    "label_index": lambda: get_label_index(),
+}
+
+def warmup(components=None):
+    """리소스를 미리 로딩 (기본: 전부), 로딩 시간(초)을 dict로 반환"""
+    timings = {}
+    for name in components or _LOADERS:
+        start = time.perf_counter()
+        _LOADERS[name]()
+        timings[name] = round(time.perf_counter() - start, 3)
+    return timings
+
+def __getattr__(name):
+    """기존 모듈 전역 이름(multi_clf, bert, df_stock 등) 접근 호환"""
+    if name in ("multi_clf", "mlb"):
+        return get_classifier()[("multi_clf", "mlb").index(name)]
+    if name in ("tokenizer", "bert", "device"):
+        return get_encoder()[("tokenizer", "bert", "device").index(name)]
+    if name == "gemini":
+        return get_gemini()
+    if name in ("df_stock", "industry_list", "theme_list"):
+        return get_stock_catalog()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ---------------------------
 # 1. 전처리
@@ -63,32 +150,115 @@ def clean_text(text):
 # ---------------------------
 # 2. BERT 임베딩
 # ---------------------------
-def embed_text(texts, batch_size=32):
-    all_embeddings = []
-    for i in range(0, len(texts), batch_size):
-        batch_texts = texts[i:i+batch_size]
-        inputs = tokenizer(batch_texts, return_tensors='pt', padding=True,
-                           truncation=True, max_length=128).to(device)
+def _compute_embeddings(texts, batch_size, max_length):
+    """
+    mean pooling 임베딩
+    - 토큰 길이순으로 정렬해 비슷한 길이끼리 배치를 묶어 패딩 최소화 (결과는 입력 순서)
+    - 패딩 토큰은 attention mask로 제외 -> 배치 구성과 무관하게 단건 호출과 같은 값
+    """
+    import numpy as np
+    import torch
+    tokenizer, bert, device = get_encoder()
+
+    encodings = tokenizer(list(texts), truncation=True, max_length=max_length)
+    order = sorted(range(len(texts)), key=lambda i: len(encodings['input_ids'][i]))
+    all_embeddings = [None] * len(texts)
+
+    for i in range(0, len(order), batch_size):
+        batch_ids = order[i:i+batch_size]
+        features = {key: [encodings[key][j] for j in batch_ids] for key in encodings.keys()}
+        inputs = tokenizer.pad(features, return_tensors='pt').to(device)
         with torch.no_grad():
             outputs = bert(**inputs)
-        embeddings = outputs.last_hidden_state.mean(dim=1).cpu().numpy()
-        all_embeddings.append(embeddings)
+        mask = inputs['attention_mask'].unsqueeze(-1).to(outputs.last_hidden_state.dtype)
+        embeddings = ((outputs.last_hidden_state * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)).cpu().numpy()
+        for j, embedding in zip(batch_ids, embeddings):
+            all_embeddings[j] = embedding
     return np.vstack(all_embeddings)
 
+def get_embedding_store(max_length=128):
+    """임베딩 저장소 (EMBEDDING_STORE_DIR가 빈 문자열이면 사용 안 함)"""
+    if not EMBEDDING_STORE_DIR:
+        return None
+
+    def load():
+        from model.embedding_store import EmbeddingStore
+        from model.model_runtime import resolve_backend
+
+        # 모델, 백엔드, 최대 길이가 같아야 같은 임베딩
+        model_id = f"{MODEL_NAME}|{resolve_backend('classifier')}|{max_length}"
+        _, bert, _ = get_encoder()
+        path = os.path.join(EMBEDDING_STORE_DIR, re.sub(r'[^0-9A-Za-z_.-]', '_', model_id))
+        return EmbeddingStore(path, model_id, bert.config.hidden_size)
+
+    return _get_resource(f"embedding_store:{max_length}", load)
+
+def embed_text(texts, batch_size=32, max_length=128, use_store=True):
+    """
+    임베딩 계산, 저장소에 있는 텍스트는 모델을 거치지 않고 재사용
+    새로 계산한 임베딩은 저장소에 추가 (저장 정밀도에 맞춰 float16으로 반올림한 값 반환)
+    """
+    import numpy as np
+    from model.embedding_store import EmbeddingStore
+
+    texts = list(texts)
+    store = get_embedding_store(max_length) if use_store else None
+    if store is None:
+        return _compute_embeddings(texts, batch_size, max_length)
+
+    keys = [EmbeddingStore.make_key(store.model_id, text) for text in texts]
+    embeddings = store.get_many(keys)
+    missing = [i for i in range(len(texts)) if i not in embeddings]
+    if missing:
+        computed = _compute_embeddings([texts[i] for i in missing], batch_size, max_length)
+        store.add_many([keys[i] for i in missing], computed)
+        for i, embedding in zip(missing, computed.astype(np.float16).astype(np.float32)):
+            embeddings[i] = embedding
+    return np.vstack([embeddings[i] for i in range(len(texts))])
+
 # ---------------------------
 # 3. 종목 정보 찾기
 # ---------------------------
-def find_stock_info(title, body):
-    combined_text = title + " " + body
-    for _, row in df_stock.iterrows():
-        name = row['stock_name']
-        if name and name in combined_text:
-            return {
+def build_stock_matcher(df_stock):
+    """
+    전체 종목명으로 Aho-Corasick 오토마톤 구성
+    반환: (matcher, 종목명 -> {"종목명", "업종명", "테마명"})
+    """
+    from model.text_matcher import AhoCorasick
+
+    stocks = {}
+    for name, industry, themes in zip(df_stock['stock_name'], df_stock['industry_group'], df_stock['themes']):
+        if name and name not in stocks:
+            stocks[name] = {
                 "종목명": name,
-                "업종명": row["industry_group"] or "",
-                "테마명": (row["themes"] or [])[0] if isinstance(row["themes"], list) and row["themes"] else ""
+                "업종명": industry or "",
+                "테마명": themes[0] if isinstance(themes, list) and themes else ""
             }
-    return None
+    return AhoCorasick(stocks).build(), stocks
+
+def get_stock_matcher():
+    return _get_resource("stock_matcher", lambda: build_stock_matcher(get_stock_catalog()["df_stock"]))
+
+def find_stock_mentions(text, stock_matcher=None):
+    """
+    본문에 언급된 모든 종목을 한 번의 순회로 탐색
+    - 겹치는 이름은 가장 긴 이름 우선 (예: "삼성전자우" > "삼성전자")
+    - 종목별 등장 위치(positions)와 횟수(count) 포함, 많이 언급된 순 (동률이면 먼저 나온 순)
+    """
+    matcher, stocks = stock_matcher or get_stock_matcher()
+    mentions = {}
+    for start, _, name in matcher.find_longest(text):
+        mention = mentions.get(name)
+        if mention is None:
+            mention = mentions[name] = dict(stocks[name], positions=[], count=0)
+        mention["positions"].append(start)
+        mention["count"] += 1
+    return sorted(mentions.values(), key=lambda m: (-m["count"], m["positions"][0]))
+
+def find_stock_info(title, body):
+    """가장 많이 언급된 종목 정보 (없으면 None)"""
+    mentions = find_stock_mentions(title + " " + body)
+    return mentions[0] if mentions else None
 
 
 
@@ -123,7 +293,8 @@ def extract_clean_representative(category, response_text):
 # ---------------------------
 # 4. 대표 키워드 생성
 # ---------------------------
-def generate_representative(title, body, category, stock_info=None):
+def generate_representative(title, body, category, stock_info=None, candidates=None):
+    """candidates: 업종/테마 목록 대신 프롬프트에 넣을 후보 이름 목록"""
     if not isinstance(body, str):
         body = ""
 
@@ -148,7 +319,7 @@ JSON:
         prompt = f"""
 다음 뉴스 기사에서 관련성 가장 높은 업종명을 아래 업종 목록 중 하나만 선택해서 반환해주세요. 반드시 이름만 출력하세요.
 {hint}
-업종 목록: {', '.join(industry_list)}
+업종 목록: {', '.join(candidates or get_stock_catalog()['industry_list'])}
 제목: {title}
 본문: {body[:500]}
 JSON:
@@ -158,7 +329,7 @@ JSON:
         prompt = f"""
 다음 뉴스 기사에서 관련성 가장 높은 테마명을 아래 테마 목록 중 하나만 선택해서 반환해주세요. 반드시 이름만 출력하세요.
 {hint}
-테마 목록: {', '.join(theme_list)}
+테마 목록: {', '.join(candidates or get_stock_catalog()['theme_list'])}
 제목: {title}
 본문: {body[:500]}
 JSON:
@@ -176,50 +347,280 @@ JSON:
         return None, None
 
     try:
-        time.sleep(6)
-        response = gemini.generate_content(prompt)
-        response_text = response.text.strip()
+        # 호출 간격은 클라이언트의 RPM/TPM 제한으로 조절
+        response_text = get_llm_client().generate(prompt).strip()
+    except Exception as e:
+        print(f"Gemini API 오류: {e}")
+        return None, None
+
+    result = load_json_response(response_text)
+    if result is None:
+        return extract_clean_representative(category, response_text)
+    return parse_representative(category, result, strict=False) or (None, None)
+
+# ---------------------------
+# 4.5 통합 대표 키워드 생성 (기사당 LLM 호출 1회)
+# ---------------------------
+# category -> (JSON 키, 설명, 예시 값)
+REPRESENTATIVE_FIELDS = {
+    "개별주": ("stocks", "기사에서 언급된 주식 종목명, 최대 3개", ["종목1", "종목2"]),
+    "산업군": ("industry", "아래 업종 목록 중 관련성 가장 높은 업종명 하나 (이름만)", "업종명"),
+    "테마": ("theme", "아래 테마 목록 중 관련성 가장 높은 테마명 하나 (이름만)", "테마명"),
+    "전반적": ("summary", "원인->결과 형태 요약 또는 핵심 키워드, 20자 이내", "요약문 또는 핵심 키워드"),
+}
+
+# combined: 필요한 카테고리를 한 번에 요청, per_category: 카테고리마다 따로 요청
+REPRESENTATIVE_MODE = os.getenv("REPRESENTATIVE_MODE", "combined")
+# 프롬프트에 넣을 업종/테마 후보 수 (기사 임베딩과 코사인 유사도 상위)
+SHORTLIST_TOP_K = int(os.getenv("SHORTLIST_TOP_K", "10"))
+# 1위와 2위 후보의 유사도 차이가 이 값 이상이면 LLM 없이 1위로 확정 (0이면 항상 LLM 호출)
+# 라벨 이름 임베딩 유사도로 확정해도 되는 차이는 아직 검증 전이라 기본은 0, 라벨된 기사로 조정 후 설정
+SHORTLIST_SKIP_MARGIN = float(os.getenv("SHORTLIST_SKIP_MARGIN", "0"))
+
+def load_json_response(response_text):
+    """LLM 응답에서 JSON 객체 추출 (코드 블록 표시 제거), 실패하면 None"""
+    text = response_text.strip().strip("`").strip()
+    if text.startswith("json"):
+        text = text[4:]
+    try:
+        result = json.loads(text)
+    except json.JSONDecodeError:
+        match = re.search(r'\{.*\}', text, re.S)
+        if not match:
+            return None
         try:
-            result = json.loads(response_text)
-            if category == "개별주" and "stocks" in result:
-                if len(result["stocks"]) > 3:
-                    return None, "산업군"
-                return ", ".join(result["stocks"]), None
-            elif category == "산업군" and "industry" in result:
-                return result["industry"], None
-            elif category == "테마" and "theme" in result:
-                return result["theme"], None
-            elif category == "전반적" and "summary" in result:
-                return result["summary"], None
+            result = json.loads(match.group(0))
         except json.JSONDecodeError:
-            return extract_clean_representative(category, response_text)
+            return None
+    return result if isinstance(result, dict) else None
+
+def parse_representative(category, result, strict=True):
+    """
+    응답 JSON에서 카테고리 대표 키워드 검증/추출 -> (대표 키워드, 바뀐 카테고리)
+    필드가 없거나 형식이 맞지 않으면 None
+    strict: 빈 값, 목록에 없는 업종/테마도 실패로 처리
+    """
+    if not result or category not in REPRESENTATIVE_FIELDS:
+        return None
+    value = result.get(REPRESENTATIVE_FIELDS[category][0])
+
+    if category == "개별주":
+        if not isinstance(value, list):
+            return None
+        stocks = [str(stock).strip() for stock in value if str(stock).strip()]
+        if strict and not stocks:
+            return None
+        # 종목이 너무 많으면 산업군 기사로 처리
+        if len(stocks) > 3:
+            return None, "산업군"
+        return ", ".join(stocks), None
+
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if strict:
+        if not value:
+            return None
+        if category == "산업군" and value not in get_stock_catalog()['industry_list']:
+            return None
+        if category == "테마" and value not in get_stock_catalog()['theme_list']:
+            return None
+    return value, None
+
+def build_combined_prompt(title, body, categories, stock_info=None, candidates=None):
+    hint = ""
+    if stock_info:
+        hint = f"""
+힌트:
+- 이 뉴스에 언급된 종목은 \"{stock_info['종목명']}\"입니다.
+- 이 종목의 업종은 \"{stock_info['업종명']}\"이며, 주요 테마는 \"{stock_info['테마명']}\"입니다.
+"""
+    fields = "\n".join(f'- "{REPRESENTATIVE_FIELDS[c][0]}": {REPRESENTATIVE_FIELDS[c][1]}' for c in categories)
+    example = json.dumps({REPRESENTATIVE_FIELDS[c][0]: REPRESENTATIVE_FIELDS[c][2] for c in categories}, ensure_ascii=False)
+
+    candidates = candidates or {}
+    lists = ""
+    if "산업군" in categories:
+        lists += f"업종 목록: {', '.join(candidates.get('산업군') or get_stock_catalog()['industry_list'])}\n"
+    if "테마" in categories:
+        lists += f"테마 목록: {', '.join(candidates.get('테마') or get_stock_catalog()['theme_list'])}\n"
+
+    return f"""
+다음 뉴스 기사에 대해 아래 항목을 모두 채운 JSON 객체 하나만 반환해주세요. 마크다운 없이 JSON만 출력하세요.
+{fields}
+{hint}
+{lists}제목: {title}
+본문: {body[:500]}
+JSON:
+{example}
+"""
+
+def generate_combined_representatives(title, body, categories, stock_info=None, candidates=None, decided=None):
+    """
+    여러 카테고리의 대표 키워드를 LLM 호출 한 번으로 생성 -> {category: (대표 키워드, 바뀐 카테고리)}
+    - 개별주가 있으면 산업군 전환에 대비해 업종도 함께 요청
+    - 응답 전체 또는 일부 필드의 파싱/검증이 실패한 카테고리만 개별 호출로 재시도
+    candidates: {category: 후보 이름 목록}, decided: LLM 없이 이미 정해진 {category: (대표 키워드, None)}
+    """
+    if not isinstance(body, str):
+        body = ""
+    candidates = candidates or {}
+    representatives = dict(decided or {})
+    needed = [category for category in REPRESENTATIVE_FIELDS if category in categories]
+    # 개별주 -> 산업군 전환용으로만 함께 요청한 업종 (맨 뒤에 두어 개별주 결과를 먼저 확인)
+    speculative = "개별주" in needed and "산업군" not in needed
+    if speculative:
+        needed.append("산업군")
+    needed = [category for category in needed if category not in representatives]
+    if len(needed) <= 1:
+        for category in needed:
+            representatives[category] = generate_representative(title, body, category, stock_info, candidates.get(category))
+        return representatives
+
+    try:
+        response_text = get_llm_client().generate(build_combined_prompt(title, body, needed, stock_info, candidates))
     except Exception as e:
         print(f"Gemini API 오류: {e}")
-        return None, None
+        representatives.update({category: (None, None) for category in needed})
+        return representatives
+
+    result = load_json_response(response_text)
+    for category in needed:
+        parsed = parse_representative(category, result)
+        if parsed is None:
+            # 함께 요청한 업종은 개별주가 실제로 산업군으로 바뀐 경우에만 개별 호출로 재시도
+            if category == "산업군" and speculative and representatives.get("개별주", (None, None))[1] != "산업군":
+                continue
+            parsed = generate_representative(title, body, category, stock_info, candidates.get(category))
+        representatives[category] = parsed
+    return representatives
+
+# ---------------------------
+# 4.6 업종/테마 후보 (임베딩 유사도)
+# ---------------------------
+def _normalize_rows(vecs):
+    import numpy as np
+    return vecs / np.clip(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12, None)
+
+def _load_label_index():
+    catalog = get_stock_catalog()
+    index = {}
+    for category, names in (("산업군", catalog['industry_list']), ("테마", catalog['theme_list'])):
+        if names:
+            index[category] = (list(names), _normalize_rows(embed_text(names)))
+    return index
+
+def get_label_index():
+    """{"산업군" | "테마": (이름 목록, 정규화된 이름 임베딩 행렬)}"""
+    return _get_resource("label_index", _load_label_index)
+
+def shortlist_labels(vecs, top_k=None):
+    """
+    기사 임베딩별 업종/테마 후보
+    반환: 기사별 {category: [(이름, 코사인 유사도), ...]} (유사도 내림차순, 최대 top_k개)
+    """
+    import numpy as np
+    top_k = top_k or SHORTLIST_TOP_K
+    vecs = _normalize_rows(np.asarray(vecs, dtype=np.float32))
+    shortlists = [{} for _ in range(len(vecs))]
+
+    for category, (names, label_vecs) in get_label_index().items():
+        scores = vecs @ label_vecs.T
+        k = min(top_k, len(names))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        for shortlist, row, idx in zip(shortlists, scores, top):
+            idx = idx[np.argsort(-row[idx])]
+            shortlist[category] = [(names[i], float(row[i])) for i in idx]
+    return shortlists
+
+def shortlist_winner(shortlist):
+    """1위 후보가 2위보다 SHORTLIST_SKIP_MARGIN 이상 앞서면 1위 이름, 아니면 None"""
+    if SHORTLIST_SKIP_MARGIN <= 0 or not shortlist:
+        return None
+    if len(shortlist) == 1 or shortlist[0][1] - shortlist[1][1] >= SHORTLIST_SKIP_MARGIN:
+        return shortlist[0][0]
+    return None
 
 # ---------------------------
 # 5. 예측 함수
 # ---------------------------
-def predict_categories_with_representatives(title, body, threshold=0.3):
-    cleaned_body = clean_text(body)
-    text = title + " " + cleaned_body
-    stock_info = find_stock_info(title, cleaned_body)
-    vec = embed_text([text])
-    y_proba = multi_clf.predict_proba(vec)
+def predict_categories_for_batch(articles, threshold=0.3, batch_size=32):
+    """
+    여러 기사를 한 번에 분류 (LLM 호출 없음)
+    - 전처리/종목 탐색 후 전체 임베딩과 predict_proba를 한 번에 수행
+    - 대표 키워드는 generate_representatives()에서 별도 단계로 생성
+    articles: (title, body) 목록
+    반환: 기사별 {"title", "cleaned_body", "stock_info", "categories": [(category, prob), ...],
+                  "shortlists": {"산업군" | "테마": [(후보 이름, 유사도), ...]}}
+    """
+    prepared = []
+    for title, body in articles:
+        cleaned_body = clean_text(body)
+        prepared.append({
+            "title": title,
+            "cleaned_body": cleaned_body,
+            "stock_info": find_stock_info(title, cleaned_body),
+            "categories": [],
+            "shortlists": {}
+        })
+    if not prepared:
+        return []
+
+    multi_clf, mlb = get_classifier()
+    vecs = embed_text([p["title"] + " " + p["cleaned_body"] for p in prepared], batch_size=batch_size)
+    y_proba = multi_clf.predict_proba(vecs)
 
-    results = []
     for i, category in enumerate(mlb.classes_):
-        prob = y_proba[i][0][1]
-        if prob >= threshold:
-            representative, new_cat = generate_representative(title, cleaned_body, category, stock_info)
-            final_category = new_cat if new_cat else category
-            if new_cat:
-                representative, _ = generate_representative(title, cleaned_body, new_cat, stock_info)
-            results.append({
-                "category": final_category,
-                "representative": representative,
-                "prob": prob
-            })
+        for prediction, prob in zip(prepared, y_proba[i][:, 1]):
+            if prob >= threshold:
+                prediction["categories"].append((category, prob))
+
+    # 같은 임베딩으로 업종/테마 후보 선정
+    for prediction, shortlists in zip(prepared, shortlist_labels(vecs)):
+        prediction["shortlists"] = shortlists
+
+    return prepared
+
+def generate_representatives(prediction, mode=None):
+    """분류 결과에 LLM 대표 키워드를 붙여 최종 결과 생성 (mode: combined | per_category)"""
+    title, cleaned_body, stock_info = prediction["title"], prediction["cleaned_body"], prediction["stock_info"]
+    mode = mode or REPRESENTATIVE_MODE
+
+    # 업종/테마 후보, 후보 1위가 뚜렷하면 LLM 없이 확정
+    shortlists = prediction.get("shortlists") or {}
+    candidates, decided = {}, {}
+    for category, shortlist in shortlists.items():
+        candidates[category] = [name for name, _ in shortlist]
+        winner = shortlist_winner(shortlist)
+        if winner:
+            decided[category] = (winner, None)
+
+    def single(category):
+        if category in decided:
+            return decided[category]
+        return generate_representative(title, cleaned_body, category, stock_info, candidates.get(category))
+
+    if mode == "combined":
+        categories = [category for category, _ in prediction["categories"]]
+        combined = generate_combined_representatives(title, cleaned_body, categories, stock_info, candidates, decided)
+
+    results = []
+    for category, prob in prediction["categories"]:
+        if mode == "combined":
+            representative, new_cat = combined.get(category, (None, None))
+        else:
+            representative, new_cat = single(category)
+        final_category = new_cat if new_cat else category
+        if new_cat:
+            if mode == "combined" and new_cat in combined:
+                representative, _ = combined[new_cat]
+            else:
+                representative, _ = single(new_cat)
+        results.append({
+            "category": final_category,
+            "representative": representative,
+            "prob": prob
+        })
 
     if not results:
         results.append({
@@ -229,3 +630,6 @@ def predict_categories_with_representatives(title, body, threshold=0.3):
         })
 
     return results
+
+def predict_categories_with_representatives(title, body, threshold=0.3):
+    return generate_representatives(predict_categories_for_batch([(title, body)], threshold)[0])
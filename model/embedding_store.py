@@ -0,0 +1,160 @@
+# model/embedding_store.py
+"""
+디스크 임베딩 저장소
+(모델 식별자, 텍스트) 해시를 키로 임베딩을 append-only float16 행렬에 저장하고 memmap으로 읽음
+
+디렉터리 구성
+- meta.json       : 모델 식별자, 차원
+- embeddings.f16  : (N, dim) float16 행렬, 끝에 이어 쓰기
+- keys.bin        : 행 순서대로 32바이트 sha256 키 (키가 있으면 해당 행도 기록된 상태)
+"""
+
+import os
+import json
+import hashlib
+import threading
+
+import numpy as np
+
+try:
+    import fcntl  # 여러 프로세스가 같은 저장소에 쓸 때 잠금 (POSIX)
+except ImportError:
+    fcntl = None
+
+KEY_SIZE = 32
+
+
+class EmbeddingStore:
+    """모델별 임베딩 저장소 (스레드/프로세스 안전 append)"""
+
+    def __init__(self, path, model_id, dim):
+        self.path = path
+        self.model_id = model_id
+        self.dim = dim
+        self._matrix_path = os.path.join(path, "embeddings.f16")
+        self._keys_path = os.path.join(path, "keys.bin")
+        self._lock_path = os.path.join(path, ".lock")
+        self._index = {}
+        self._count = 0
+        self._mmap = None
+        self._lock = threading.Lock()
+
+        os.makedirs(path, exist_ok=True)
+        self._check_meta()
+        with self._file_lock():
+            self._repair()
+            self._refresh()
+
+    @staticmethod
+    def make_key(model_id, text):
+        return hashlib.sha256(f"{model_id}\0{text}".encode("utf-8")).digest()
+
+    def __len__(self):
+        return self._count
+
+    def _check_meta(self):
+        meta_path = os.path.join(self.path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["model_id"] != self.model_id or meta["dim"] != self.dim:
+                raise ValueError(f"임베딩 저장소 불일치: {meta} (요청: {self.model_id}, dim={self.dim})")
+            return
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"model_id": self.model_id, "dim": self.dim}, f, ensure_ascii=False)
+
+    def _file_lock(self):
+        return _FileLock(self._lock_path)
+
+    def _repair(self):
+        """중단된 append로 남은 키 없는 행/잘린 키 제거"""
+        key_bytes = os.path.getsize(self._keys_path) if os.path.exists(self._keys_path) else 0
+        rows = key_bytes // KEY_SIZE
+        if key_bytes != rows * KEY_SIZE:
+            with open(self._keys_path, "r+b") as f:
+                f.truncate(rows * KEY_SIZE)
+        row_bytes = self.dim * 2
+        if os.path.exists(self._matrix_path) and os.path.getsize(self._matrix_path) != rows * row_bytes:
+            with open(self._matrix_path, "r+b") as f:
+                f.truncate(rows * row_bytes)
+
+    def _refresh(self):
+        """다른 프로세스가 추가한 키를 인덱스에 반영"""
+        if not os.path.exists(self._keys_path):
+            return
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._count * KEY_SIZE)
+            data = f.read()
+        rows = len(data) // KEY_SIZE
+        for i in range(rows):
+            self._index[data[i * KEY_SIZE:(i + 1) * KEY_SIZE]] = self._count + i
+        self._count += rows
+
+    def _matrix(self):
+        """현재 행 수에 맞춘 읽기 전용 memmap"""
+        if self._mmap is None or self._mmap.shape[0] < self._count:
+            self._mmap = np.memmap(self._matrix_path, dtype=np.float16, mode="r", shape=(self._count, self.dim))
+        return self._mmap
+
+    def get_many(self, keys):
+        """키 목록 조회 -> {키 위치: float32 임베딩}"""
+        with self._lock:
+            if any(key not in self._index for key in keys):
+                self._refresh()
+            positions = [(i, self._index[key]) for i, key in enumerate(keys) if key in self._index]
+            if not positions:
+                return {}
+            matrix = self._matrix()
+            return {i: np.asarray(matrix[row], dtype=np.float32) for i, row in positions}
+
+    def add_many(self, keys, embeddings):
+        """새 임베딩 추가 (이미 있는 키는 건너뜀), float16으로 저장"""
+        embeddings = np.asarray(embeddings, dtype=np.float16).reshape(len(keys), self.dim)
+        with self._lock, self._file_lock():
+            # 다른 프로세스가 append 도중 종료해 남긴 키 없는 행/잘린 키를 먼저 제거
+            # (남겨 두면 이어 쓴 행이 키와 어긋나 다른 임베딩을 돌려줌)
+            self._repair()
+            self._refresh()
+            new_rows = []
+            pending = set()
+            for key, embedding in zip(keys, embeddings):
+                if key not in self._index and key not in pending:
+                    pending.add(key)
+                    new_rows.append((key, embedding))
+            if not new_rows:
+                return 0
+
+            # 행렬을 먼저 쓰고 키를 나중에 써서, 키가 있으면 행도 있도록 보장
+            with open(self._matrix_path, "ab") as f:
+                f.write(np.stack([embedding for _, embedding in new_rows]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self._keys_path, "ab") as f:
+                f.write(b"".join(key for key, _ in new_rows))
+                f.flush()
+                os.fsync(f.fileno())
+            # 기록이 끝난 뒤에 인덱스 반영 (쓰기 실패 시 없는 행을 가리키지 않도록)
+            for i, (key, _) in enumerate(new_rows):
+                self._index[key] = self._count + i
+            self._count += len(new_rows)
+            return len(new_rows)
+
+
+class _FileLock:
+    """fcntl 파일 잠금 (지원하지 않는 OS에서는 아무것도 하지 않음)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._file = open(self.path, "a")
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
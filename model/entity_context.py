@@ -0,0 +1,83 @@
+# model/entity_context.py
+"""
+엔티티 문맥 추출
+본문을 한 번만 문장 분리하고 모든 엔티티의 관련 문장을 함께 반환
+"""
+
+from bisect import bisect_right
+
+
+# 문장 종결 부호 (종결 부호는 앞 문장에 포함)
+TERMINATORS = ('.', '?', '!', '。', '\n')
+
+
+def _is_boundary(text, position):
+    """position 위치의 종결 부호가 문장 경계인지 판단"""
+    char = text[position]
+    if char == '\n':
+        return True
+    following = text[position + 1:position + 2]
+    if not following or following.isspace():
+        return True
+    # 공백 없이 붙어 쓴 한글 종결 ("...했다.삼성전자는"), 숫자 소수점/말줄임표는 제외
+    return '가' <= text[position - 1:position] <= '힣' and not following.isdigit() and following not in TERMINATORS
+
+
+def split_sentences(text):
+    """
+    문장 단위로 분리해 (start, end, sentence) 목록 반환
+    정규식 대신 str.find로 종결 부호 후보만 모은 뒤 경계 여부를 판단
+    """
+    positions = []
+    for terminator in TERMINATORS:
+        position = text.find(terminator)
+        while position != -1:
+            positions.append(position)
+            position = text.find(terminator, position + 1)
+    positions.sort()
+
+    sentences = []
+    start = 0
+    for position in positions:
+        if position < start or not _is_boundary(text, position):
+            continue
+        end = position + 1
+        sentence = text[start:end].strip()
+        if sentence:
+            sentences.append((start, end, sentence))
+        start = end
+    sentence = text[start:].strip()
+    if sentence:
+        sentences.append((start, len(text), sentence))
+    return sentences
+
+
+def extract_entity_contexts(content, entity_names, max_sentences=2, fallback_chars=200):
+    """
+    엔티티별 관련 문맥 추출
+    - 문장 분리는 본문당 한 번, 엔티티 위치는 str.find로 찾아 이분 탐색으로 문장에 대응
+    - 엔티티가 등장하는 문장을 본문 순서대로 최대 max_sentences개 이어 붙임
+    - 등장하지 않으면 본문 앞 fallback_chars자 사용
+    """
+    sentences = split_sentences(content)
+    starts = [start for start, _, _ in sentences]
+
+    contexts = {}
+    for name in dict.fromkeys(name for name in entity_names if name):
+        indices = []
+        position = content.find(name)
+        while position != -1 and len(indices) < max_sentences:
+            index = bisect_right(starts, position) - 1
+            if index >= 0 and position < sentences[index][1]:
+                if index not in indices:
+                    indices.append(index)
+                # 같은 문장 안의 나머지 등장은 건너뜀
+                position = content.find(name, max(position + 1, sentences[index][1]))
+            else:
+                position = content.find(name, position + 1)
+
+        if indices:
+            contexts[name] = ' '.join(sentences[i][2] for i in indices)
+        else:
+            contexts[name] = content[:fallback_chars]
+    return contexts
@@ -0,0 +1,136 @@
+# model/llm_cache.py
+"""
+LLM 프롬프트/응답 캐시
+(모델명, 공백 정규화한 프롬프트 해시)를 키로 응답을 SQLite에 저장
+같은 프롬프트를 다시 보내는 재실행(중단 후 재시작, 같은 예측 시계열 등)은 API를 호출하지 않음
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_PATH = os.path.join(BASE_DIR, "data", "llm_cache.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used);
+"""
+
+
+def normalize_prompt(prompt):
+    """들여쓰기/줄바꿈 차이만 있는 프롬프트는 같은 키가 되도록 공백 정리"""
+    return " ".join(prompt.split())
+
+
+class LLMCache:
+    """TTL/최대 항목 수 제한이 있는 SQLite 응답 캐시 (스레드/프로세스 공유 가능)"""
+
+    def __init__(self, path=DEFAULT_PATH, ttl_seconds=30 * 86400, max_entries=100000, bypass=False):
+        """
+        ttl_seconds: 항목 유효 시간 (0이면 만료 없음)
+        max_entries: 최대 항목 수 (초과 시 가장 오래 안 쓴 항목부터 제거)
+        bypass: True면 조회는 하지 않고 새 응답 저장만 (캐시 갱신용)
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        # 여러 프로세스가 동시에 읽고 쓸 수 있도록 WAL 모드
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def make_key(model_name, prompt):
+        digest = hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+        return f"{model_name}:{digest}"
+
+    def get(self, model_name, prompt):
+        """캐시된 응답 (없거나 만료, bypass면 None)"""
+        if self.bypass:
+            return None
+        key = self.make_key(model_name, prompt)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, model_name, prompt, response):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (self.make_key(model_name, prompt), model_name, response, now, now)
+            )
+            self._writes += 1
+            # 매번 세지 않고 일정 간격으로 만료/초과 항목 정리
+            if self._writes % 100 == 0:
+                self._evict(now)
+
+    def _evict(self, now):
+        if self.ttl_seconds > 0:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "bypass": self.bypass,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def cache_from_env():
+    """LLM_CACHE_PATH(빈 문자열이면 사용 안 함), LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_BYPASS"""
+    path = os.getenv("LLM_CACHE_PATH", DEFAULT_PATH)
+    if not path:
+        return None
+    return LLMCache(
+        path,
+        ttl_seconds=int(os.getenv("LLM_CACHE_TTL", str(30 * 86400))),
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "100000")),
+        bypass=os.getenv("LLM_CACHE_BYPASS", "0").lower() in ("1", "true", "yes"),
+    )
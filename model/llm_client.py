@@ -0,0 +1,267 @@
+# model/llm_client.py
+"""
+속도 제한 LLM 클라이언트
+분당 요청 수(RPM)/토큰 수(TPM) 토큰 버킷, 동시 요청 수 제한, 429/5xx 지터 백오프 재시도
+asyncio로 동작하고, 동기 코드에서는 백그라운드 이벤트 루프를 쓰는 LLMClient로 호출
+응답 캐시(model/llm_cache.py)를 주면 같은 프롬프트는 API 호출 없이 캐시에서 반환
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# 백엔드 응답 (total_tokens는 모르면 None)
+LLMResponse = namedtuple("LLMResponse", ["text", "total_tokens"])
+
+RETRYABLE_STATUS = {408, 429}
+
+
+class LLMError(Exception):
+    """HTTP 상태 코드를 가진 LLM 호출 오류"""
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def error_status(exc):
+    """예외에서 HTTP 상태 코드 추출 (google.api_core 예외는 code 속성)"""
+    status = getattr(exc, "status", None)
+    if status is None:
+        status = getattr(exc, "code", None)
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc):
+    """429, 5xx, 타임아웃/연결 오류는 재시도"""
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = error_status(exc)
+    return status is not None and (status in RETRYABLE_STATUS or status >= 500)
+
+
+def estimate_tokens(text, chars_per_token=2.0):
+    """대략적인 토큰 수 (한국어 기준 글자 2개당 1토큰 정도)"""
+    return max(1, int(len(text) / chars_per_token))
+
+
+# ---------------------------
+# 백엔드
+# ---------------------------
+class GeminiBackend:
+    """google.generativeai GenerativeModel 비동기 호출"""
+
+    def __init__(self, model):
+        self.model = model
+        self.name = getattr(model, "model_name", "gemini")
+
+    async def generate(self, prompt):
+        response = await self.model.generate_content_async(prompt)
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(response.text, getattr(usage, "total_token_count", None))
+
+
+class StubBackend:
+    """테스트/로컬 실행용 가짜 백엔드 (네트워크 호출 없음)"""
+
+    def __init__(self, responder=None, latency=0.0, failures=None):
+        """
+        responder: prompt -> 응답 텍스트 함수 (기본: "{}")
+        latency: 호출당 지연 시간(초)
+        failures: 앞쪽 호출에서 순서대로 낼 오류 상태 코드 목록 (예: [429, 503])
+        """
+        self.responder = responder or (lambda prompt: "{}")
+        self.latency = latency
+        self.failures = list(failures or [])
+        self.calls = 0
+        self.name = "stub"
+
+    async def generate(self, prompt):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failures:
+            status = self.failures.pop(0)
+            raise LLMError(f"stub error {status}", status=status)
+        text = self.responder(prompt)
+        return LLMResponse(text, estimate_tokens(prompt) + estimate_tokens(text))
+
+
+# ---------------------------
+# 속도 제한
+# ---------------------------
+class TokenBucket:
+    """분당 채워지는 토큰 버킷 (capacity만큼 순간 사용 가능)"""
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount=1):
+        """토큰이 찰 때까지 기다린 뒤 차감, 기다린 시간(초) 반환"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        # 잠금을 잡고 기다려서 먼저 온 요청부터 처리
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def adjust(self, delta):
+        """실제 사용량과 추정치 차이 반영 (음수 잔량 허용 -> 이후 요청이 대기)"""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - delta)
+
+
+class AsyncLLMClient:
+    """asyncio 기반 속도 제한/재시도 클라이언트"""
+
+    def __init__(self, backend, rpm=15, tpm=1_000_000, max_concurrency=4, max_retries=5,
+                 base_delay=1.0, max_delay=60.0, timeout=60.0, output_tokens=256, cache=None):
+        """
+        rpm/tpm: 분당 요청/토큰 한도 (0이면 제한 없음)
+        max_concurrency: 동시에 진행할 최대 요청 수
+        max_retries: 429/5xx 재시도 횟수
+        base_delay/max_delay: 지수 백오프 시작/최대 대기 시간(초), 실제 대기는 0~해당 값 사이 무작위
+        timeout: 요청당 제한 시간(초)
+        output_tokens: TPM 계산 시 응답용으로 미리 잡아둘 토큰 수
+        cache: LLMCache (None이면 캐시 사용 안 함)
+        """
+        self.backend = backend
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.output_tokens = output_tokens
+        self.cache = cache
+        self._requests = TokenBucket(rpm) if rpm else None
+        self._tokens = TokenBucket(tpm) if tpm else None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._stats = {"requests": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0}
+
+    def stats(self):
+        stats = dict(self._stats, throttled_seconds=round(self._stats["throttled_seconds"], 3))
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+    async def _throttle(self, estimated):
+        waited = 0.0
+        if self._requests:
+            waited += await self._requests.acquire(1)
+        if self._tokens:
+            waited += await self._tokens.acquire(estimated)
+        self._stats["throttled_seconds"] += waited
+
+    def _backoff(self, attempt, exc):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = getattr(exc, "retry_after", None)
+        return max(delay, retry_after) if retry_after else delay
+
+    async def generate(self, prompt, use_cache=True):
+        """프롬프트 응답 텍스트 반환 (재시도 후에도 실패하면 마지막 예외 전달)"""
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(self.backend.name, prompt)
+            if cached is not None:
+                return cached
+
+        estimated = estimate_tokens(prompt) + self.output_tokens
+        for attempt in range(self.max_retries + 1):
+            await self._throttle(estimated)
+            try:
+                async with self._semaphore:
+                    self._stats["requests"] += 1
+                    response = await asyncio.wait_for(self.backend.generate(prompt), self.timeout)
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    self._stats["failures"] += 1
+                    raise
+                delay = self._backoff(attempt, e)
+                self._stats["retries"] += 1
+                logger.warning("LLM 호출 재시도 %d/%d (%.1f초 후): %s", attempt + 1, self.max_retries, delay, e)
+                await asyncio.sleep(delay)
+                continue
+
+            if self._tokens and response.total_tokens:
+                self._tokens.adjust(response.total_tokens - estimated)
+            if cache is not None:
+                cache.set(self.backend.name, prompt, response.text)
+            return response.text
+
+
+class LLMClient:
+    """동기 코드용 래퍼, 백그라운드 스레드의 이벤트 루프에서 AsyncLLMClient 실행"""
+
+    def __init__(self, backend, **limits):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client", daemon=True)
+        self._thread.start()
+        self.async_client = AsyncLLMClient(backend, **limits)
+
+    def submit(self, prompt, use_cache=True):
+        """요청을 이벤트 루프에 넣고 concurrent.futures.Future 반환"""
+        return asyncio.run_coroutine_threadsafe(self.async_client.generate(prompt, use_cache), self._loop)
+
+    def generate(self, prompt, use_cache=True):
+        return self.submit(prompt, use_cache).result()
+
+    def stats(self):
+        return self.async_client.stats()
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        if self.async_client.cache is not None:
+            self.async_client.cache.close()
+
+
+def limits_from_env():
+    """LLM_RPM, LLM_TPM, LLM_MAX_CONCURRENCY, LLM_MAX_RETRIES, LLM_TIMEOUT 환경변수"""
+    return {
+        "rpm": int(os.getenv("LLM_RPM", "15")),
+        "tpm": int(os.getenv("LLM_TPM", "1000000")),
+        "max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+        "max_retries": int(os.getenv("LLM_MAX_RETRIES", "5")),
+        "timeout": float(os.getenv("LLM_TIMEOUT", "60")),
+    }
+
+
+def create_gemini_client(model_name="gemini-1.5-flash", backend=None):
+    """
+    환경변수 설정(LLM_BACKEND, LLM_* 제한, LLM_CACHE_*)으로 만든 공용 클라이언트
+    backend: "gemini" | "stub" (기본: LLM_BACKEND)
+    """
+    from model.llm_cache import cache_from_env
+
+    backend = backend or os.getenv("LLM_BACKEND", "gemini")
+    if backend == "stub":
+        llm_backend = StubBackend()
+    else:
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        llm_backend = GeminiBackend(genai.GenerativeModel(model_name))
+    return LLMClient(llm_backend, cache=cache_from_env(), **limits_from_env())
@@ -0,0 +1,88 @@
+# model/micro_batcher.py
+"""
+요청 간 동적 마이크로 배칭
+여러 요청 스레드가 넣은 텍스트를 짧은 대기 시간 동안 모아 한 번에 추론
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """큐를 비우며 여러 요청의 텍스트를 하나의 배치로 합쳐 추론하는 단일 워커"""
+
+    def __init__(self, infer_fn, max_batch_texts=64, max_wait_ms=10):
+        """
+        infer_fn: 텍스트 리스트를 받아 같은 길이의 결과 리스트를 반환하는 함수
+        max_batch_texts: 한 배치에 모을 최대 텍스트 수 (도달 즉시 추론)
+        max_wait_ms: 첫 요청 이후 다른 요청을 기다리는 최대 시간
+        """
+        self.infer_fn = infer_fn
+        self.max_batch_texts = max_batch_texts
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """추론 워커 스레드 시작 (이미 실행 중이면 무시)"""
+        if not self.running:
+            self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def qsize(self):
+        """대기 중인 요청 수"""
+        return self._queue.qsize()
+
+    def submit(self, texts):
+        """텍스트 묶음을 큐에 넣고 결과를 받을 Future 반환"""
+        future = Future()
+        texts = list(texts)
+        if not texts:
+            future.set_result([])
+            return future
+        self._queue.put((texts, future))
+        return future
+
+    def _collect(self):
+        """첫 요청을 기다린 뒤 대기 시간 또는 최대 텍스트 수에 닿을 때까지 요청을 모음"""
+        pending = [self._queue.get()]
+        size = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch_texts:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.append(item)
+            size += len(item[0])
+
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            texts = [text for request_texts, _ in pending for text in request_texts]
+
+            try:
+                outputs = self.infer_fn(texts)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            # 요청별로 결과를 잘라서 전달
+            offset = 0
+            for request_texts, future in pending:
+                future.set_result(outputs[offset:offset + len(request_texts)])
+                offset += len(request_texts)
@@ -0,0 +1,123 @@
+# model/model_runtime.py
+"""
+Hugging Face 모델 공용 런타임
+같은 호출 코드로 eager / int8(동적 양자화) / onnx(ONNX Runtime) 백엔드를 설정에 따라 선택
+변환된 산출물은 디스크에 캐시해 다음 로딩부터 재사용
+
+백엔드 선택 우선순위: 함수 인자 > MODEL_BACKEND_<COMPONENT> > MODEL_BACKEND > eager
+예) MODEL_BACKEND=int8, MODEL_BACKEND_SENTIMENT=onnx
+"""
+
+import os
+import logging
+
+import torch
+from transformers import (
+    AutoConfig,
+    AutoTokenizer,
+    AutoModel,
+    AutoModelForSequenceClassification,
+    AutoModelForTokenClassification,
+)
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR = os.getenv("MODEL_RUNTIME_CACHE_DIR", os.path.join(BASE_DIR, "model", ".runtime_cache"))
+ORT_THREADS = int(os.getenv("MODEL_RUNTIME_ORT_THREADS", "0"))  # 0이면 ONNX Runtime 기본값
+
+BACKENDS = ("eager", "int8", "onnx")
+
+# task -> (transformers Auto 클래스, optimum ORT 클래스 이름)
+TASKS = {
+    "sequence-classification": (AutoModelForSequenceClassification, "ORTModelForSequenceClassification"),
+    "feature-extraction": (AutoModel, "ORTModelForFeatureExtraction"),
+    "token-classification": (AutoModelForTokenClassification, "ORTModelForTokenClassification"),
+}
+
+
+def resolve_backend(component=None, backend=None):
+    """설정에서 사용할 백엔드 결정"""
+    if backend is None and component:
+        backend = os.getenv(f"MODEL_BACKEND_{component.upper()}")
+    backend = (backend or os.getenv("MODEL_BACKEND") or "eager").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 백엔드: {backend} (가능: {BACKENDS})")
+    return backend
+
+
+def artifact_dir(model_name, backend):
+    """변환 산출물 캐시 경로"""
+    return os.path.join(CACHE_DIR, backend, model_name.replace("/", "__"))
+
+
+def _quantize(model):
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_int8(model_name, auto_class):
+    """Linear 레이어를 int8 동적 양자화 (CPU 전용), 양자화된 가중치를 캐시"""
+    path = os.path.join(artifact_dir(model_name, "int8"), "quantized_state_dict.pt")
+
+    if os.path.exists(path):
+        model = auto_class.from_config(AutoConfig.from_pretrained(model_name))
+        model = _quantize(model.eval())
+        model.load_state_dict(torch.load(path))
+        logger.info(f"📦 int8 캐시 로딩: {path}")
+        return model
+
+    model = _quantize(auto_class.from_pretrained(model_name).eval())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    torch.save(model.state_dict(), path)
+    logger.info(f"💾 int8 변환 결과 저장: {path}")
+    return model
+
+
+def _load_onnx(model_name, ort_class_name):
+    """ONNX로 export 후 ONNX Runtime으로 로딩, export 결과를 캐시"""
+    try:
+        import optimum.onnxruntime as ort_models
+        import onnxruntime
+    except ImportError as e:
+        raise ImportError("onnx 백엔드에는 optimum[onnxruntime] 설치가 필요합니다") from e
+
+    ort_class = getattr(ort_models, ort_class_name)
+    session_options = onnxruntime.SessionOptions()
+    if ORT_THREADS:
+        session_options.intra_op_num_threads = ORT_THREADS
+
+    path = artifact_dir(model_name, "onnx")
+    if os.path.exists(os.path.join(path, "model.onnx")):
+        logger.info(f"📦 ONNX 캐시 로딩: {path}")
+        return ort_class.from_pretrained(path, session_options=session_options)
+
+    model = ort_class.from_pretrained(model_name, export=True, session_options=session_options)
+    model.save_pretrained(path)
+    logger.info(f"💾 ONNX 변환 결과 저장: {path}")
+    return model
+
+
+def load_hf_model(model_name, task, component=None, backend=None, device=None):
+    """
+    토크나이저와 모델을 선택된 백엔드로 로딩
+    - task: sequence-classification / feature-extraction / token-classification
+    - device: eager 백엔드에서만 사용 (int8, onnx는 CPU)
+    반환: (tokenizer, model, backend)
+    """
+    if task not in TASKS:
+        raise ValueError(f"지원하지 않는 task: {task} (가능: {tuple(TASKS)})")
+    auto_class, ort_class_name = TASKS[task]
+    backend = resolve_backend(component, backend)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if backend == "int8":
+        model = _load_int8(model_name, auto_class)
+    elif backend == "onnx":
+        model = _load_onnx(model_name, ort_class_name)
+    else:
+        model = auto_class.from_pretrained(model_name).eval()
+        if device is not None:
+            model = model.to(device)
+
+    logger.info(f"✅ {model_name} 로딩 완료 (task={task}, backend={backend})")
+    return tokenizer, model, backend
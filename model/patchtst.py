@@ -0,0 +1,182 @@
+# model/patchtst.py
+"""
+PatchTST 종가 예측 모델과 추론 엔진
+- autoregressive: 출력 1개, 예측값을 이어 붙이며 30번 추론 (기존 체크포인트)
+- direct: 출력 30개, 한 번의 추론으로 30일 예측
+체크포인트에 저장된 설정(config)으로 어떤 head인지 결정
+"""
+
+import datetime
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+# 학습 때 사용한 하이퍼파라미터 (체크포인트와 같아야 함)
+SEQ_LEN = 30
+PATCH_SIZE = 7  # 29를 n_patches=4, patch_size=7로 자를 수 있음
+N_PATCHES = 29 // PATCH_SIZE
+D_MODEL = 64
+N_HEADS = 4
+NUM_LAYERS = 2
+HORIZON = 30
+HEADS = ("autoregressive", "direct")
+
+
+class PatchTST(nn.Module):
+    def __init__(self, input_dim, patch_size, n_patches, d_model, n_heads, num_layers, horizon=1):
+        super().__init__()
+        self.patch_size = patch_size
+        self.input_dim = input_dim
+        self.n_patches = n_patches
+        self.d_model = d_model
+        self.n_heads = n_heads
+        self.num_layers = num_layers
+        self.horizon = horizon
+
+        self.patch_embedding = nn.Linear(patch_size * input_dim, d_model)
+        encoder_layer = nn.TransformerEncoderLayer(d_model=d_model, nhead=n_heads, batch_first=True)
+        self.transformer = nn.TransformerEncoder(encoder_layer, num_layers=num_layers)
+        self.regressor = nn.Linear(d_model, horizon)
+
+    def forward(self, x):
+        # x: (batch_size, seq_len, input_dim)
+        B, L, D = x.shape
+        x = x.reshape(B, self.n_patches, self.patch_size * D)  # patching
+        x = self.patch_embedding(x)  # (B, n_patches, d_model)
+        x = self.transformer(x)  # (B, n_patches, d_model)
+        x = x.mean(dim=1)  # Global average pooling
+        out = self.regressor(x)
+        # autoregressive: (B,), direct: (B, horizon)
+        return out.squeeze() if self.horizon == 1 else out
+
+    @property
+    def head(self):
+        return "direct" if self.horizon > 1 else "autoregressive"
+
+    @property
+    def window(self):
+        return self.patch_size * self.n_patches
+
+    def config(self):
+        return {
+            "input_dim": self.input_dim, "patch_size": self.patch_size, "n_patches": self.n_patches,
+            "d_model": self.d_model, "n_heads": self.n_heads, "num_layers": self.num_layers, "horizon": self.horizon,
+        }
+
+
+def build_model(head="autoregressive", horizon=HORIZON):
+    return PatchTST(input_dim=1, patch_size=PATCH_SIZE, n_patches=N_PATCHES, d_model=D_MODEL,
+                    n_heads=N_HEADS, num_layers=NUM_LAYERS, horizon=horizon if head == "direct" else 1)
+
+
+def save_checkpoint(path, model, **metadata):
+    """state_dict + 모델 설정 + 메타데이터(head, 학습 정보 등) 저장"""
+    metadata = dict(metadata, head=model.head, saved_at=datetime.datetime.now().isoformat(timespec="seconds"))
+    torch.save({"state_dict": model.state_dict(), "config": model.config(), "metadata": metadata}, path)
+
+
+def load_checkpoint(path, device=None):
+    """
+    체크포인트를 불러와 (eval 모드 모델, 메타데이터) 반환
+    설정 없이 state_dict만 저장된 기존 체크포인트는 autoregressive head로 간주
+    """
+    device = device or torch.device("cpu")
+    checkpoint = torch.load(path, map_location=device)
+    if "state_dict" in checkpoint:
+        model = PatchTST(**checkpoint["config"])
+        model.load_state_dict(checkpoint["state_dict"])
+        metadata = checkpoint.get("metadata", {})
+    else:
+        model = build_model("autoregressive")
+        model.load_state_dict(checkpoint)
+        metadata = {"head": "autoregressive"}
+    return model.to(device).eval(), metadata
+
+
+def load_model(path, device=None):
+    """체크포인트를 불러와 eval 모드 모델 반환"""
+    return load_checkpoint(path, device)[0]
+
+
+def model_device(model):
+    """모델 파라미터가 있는 장치 (내보낸 엔진처럼 파라미터가 없으면 CPU)"""
+    parameters = getattr(model, "parameters", None)
+    return next(parameters()).device if parameters else torch.device("cpu")
+
+
+def model_inputs(model, sequences):
+    """
+    모델이 첫 예측에 읽는 구간
+    - autoregressive: 앞쪽 window일 (기존 추론 루프와 같은 구간)
+    - direct: 가장 최근 window일
+    """
+    return sequences[:, :model.window] if model.head == "autoregressive" else sequences[:, -model.window:]
+
+
+def as_2d(sequences):
+    """(stocks, seq_len) 또는 (stocks, seq_len, 1) -> (stocks, seq_len) float32 (종목이 0개여도 열 수 유지)"""
+    sequences = np.asarray(sequences, dtype=np.float32)
+    if len(sequences) == 0:
+        # 크기 0 배열은 reshape(0, -1)을 할 수 없음
+        return sequences.reshape(0, sequences.shape[1] if sequences.ndim > 1 else SEQ_LEN)
+    return sequences.reshape(len(sequences), -1)
+
+
+def sliding_predict(model, sequences, horizon=HORIZON, chunk_size=4096, device=None):
+    """
+    30일 자기회귀 예측 (기존 루프와 같은 결과)
+    - 종목별 버퍼 (chunk, seq_len + horizon)를 한 번만 할당하고, t번째 예측은 버퍼[:, t:t+window] 뷰로 계산해
+      버퍼[:, seq_len + t]에 기록 (기존 방식의 '앞 1일 제거 + 예측값 추가' 창과 같은 구간)
+    - 종목을 chunk_size개씩 나눠 메모리 사용량 제한
+    sequences: (stocks, seq_len) 또는 (stocks, seq_len, 1) scaled 종가
+    반환: (stocks, horizon) float32 scaled 예측값
+    """
+    sequences = as_2d(sequences)
+    n_stocks, seq_len = sequences.shape
+    window = model.patch_size * model.n_patches
+    if window > seq_len:
+        raise ValueError(f"입력 길이 {seq_len}가 모델 창 크기 {window}보다 짧음")
+    device = device or model_device(model)
+
+    predictions = np.empty((n_stocks, horizon), dtype=np.float32)
+    if n_stocks == 0:
+        return predictions
+    buffer = torch.empty((min(chunk_size, n_stocks), seq_len + horizon), dtype=torch.float32, device=device)
+
+    with torch.inference_mode():
+        for start in range(0, n_stocks, chunk_size):
+            stop = min(start + chunk_size, n_stocks)
+            chunk = buffer[:stop - start]
+            chunk[:, :seq_len].copy_(torch.from_numpy(sequences[start:stop]))
+            for t in range(horizon):
+                chunk[:, seq_len + t] = model(chunk[:, t:t + window].unsqueeze(-1)).reshape(-1)
+            predictions[start:stop] = chunk[:, seq_len:].cpu().numpy()
+
+    return predictions
+
+
+def direct_predict(model, sequences, horizon=HORIZON, chunk_size=4096, device=None):
+    """
+    direct head 한 번의 추론으로 horizon일 예측
+    반환: (stocks, horizon) float32 scaled 예측값
+    """
+    if horizon > model.horizon:
+        raise ValueError(f"모델 예측 길이 {model.horizon}일보다 긴 {horizon}일 요청")
+    sequences = as_2d(sequences)
+    inputs = torch.from_numpy(np.ascontiguousarray(model_inputs(model, sequences)))
+    device = device or model_device(model)
+
+    predictions = np.empty((len(sequences), horizon), dtype=np.float32)
+    with torch.inference_mode():
+        for start in range(0, len(sequences), chunk_size):
+            chunk = inputs[start:start + chunk_size].to(device).unsqueeze(-1)
+            predictions[start:start + len(chunk)] = model(chunk)[:, :horizon].cpu().numpy()
+    return predictions
+
+
+def predict(model, sequences, horizon=HORIZON, chunk_size=4096, device=None):
+    """모델 head에 맞는 방식으로 (stocks, horizon) 예측"""
+    if model.head == "direct":
+        return direct_predict(model, sequences, horizon, chunk_size, device)
+    return sliding_predict(model, sequences, horizon, chunk_size, device)
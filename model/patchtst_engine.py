@@ -0,0 +1,113 @@
+# model/patchtst_engine.py
+"""
+PatchTST 추론 엔진
+체크포인트를 TorchScript(.pt) 또는 ONNX(.onnx)로 내보내고(배치 차원 가변), 스레드 설정을 지정해 불러옴
+엔진은 PatchTST와 같은 속성(head, window, horizon ...)과 호출 방식을 가져 patchtst.predict()에 그대로 사용
+
+- 내보낸 파일 옆에 <파일>.json으로 모델 설정/메타데이터 저장 (엔진 로딩 시 PatchTST 클래스 불필요)
+- 스레드: PATCHTST_INTRA_THREADS(연산 내부), PATCHTST_INTER_THREADS(연산 간), 0이면 라이브러리 기본값
+"""
+
+import os
+import json
+
+import numpy as np
+import torch
+
+from model.patchtst import load_checkpoint
+
+FORMATS = ("torchscript", "onnx")
+SUFFIXES = {".pt": "torchscript", ".ts": "torchscript", ".onnx": "onnx"}
+
+
+def export_model(checkpoint_path, output_path, fmt=None, opset=17):
+    """체크포인트를 TorchScript/ONNX로 내보내고 (형식, 메타데이터) 반환"""
+    fmt = fmt or SUFFIXES.get(os.path.splitext(output_path)[1], "torchscript")
+    model, metadata = load_checkpoint(checkpoint_path)
+    example = torch.rand(2, model.window, model.input_dim)
+
+    # no_grad로 추적하면 TransformerEncoderLayer가 fast path 전용 연산으로 기록되어 ONNX로 내보낼 수 없으므로
+    # 일반 연산 경로로 추적 (TorchScript는 freeze 단계에서 상수 접기/연산 융합)
+    if fmt == "torchscript":
+        traced = torch.jit.trace(model, example)
+        torch.jit.save(torch.jit.freeze(traced), output_path)
+    elif fmt == "onnx":
+        torch.onnx.export(
+            model, example, output_path, input_names=["x"], output_names=["y"], opset_version=opset,
+            dynamic_axes={"x": {0: "batch"}, "y": {0: "batch"}},
+        )
+    else:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (가능: {', '.join(FORMATS)})")
+
+    metadata = dict(metadata, format=fmt, source=os.path.abspath(checkpoint_path))
+    with open(output_path + ".json", "w", encoding="utf-8") as f:
+        json.dump({"config": model.config(), "metadata": metadata}, f, ensure_ascii=False, indent=2)
+    return fmt, metadata
+
+
+class PatchTSTEngine:
+    """내보낸 PatchTST 모델 실행기 (TorchScript 또는 ONNX Runtime)"""
+
+    def __init__(self, path, intra_threads=None, inter_threads=None):
+        self.path = path
+        self.format = SUFFIXES.get(os.path.splitext(path)[1])
+        if self.format is None:
+            raise ValueError(f"엔진 파일 확장자는 {', '.join(SUFFIXES)} 중 하나: {path}")
+        with open(path + ".json", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        self.config = sidecar["config"]
+        self.metadata = sidecar["metadata"]
+        for key in ("input_dim", "patch_size", "n_patches", "horizon"):
+            setattr(self, key, self.config[key])
+
+        intra_threads = int(os.getenv("PATCHTST_INTRA_THREADS", "0")) if intra_threads is None else intra_threads
+        inter_threads = int(os.getenv("PATCHTST_INTER_THREADS", "0")) if inter_threads is None else inter_threads
+        if self.format == "onnx":
+            import onnxruntime as ort
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL if inter_threads > 1 else ort.ExecutionMode.ORT_SEQUENTIAL
+            if intra_threads:
+                options.intra_op_num_threads = intra_threads
+            if inter_threads:
+                options.inter_op_num_threads = inter_threads
+            self._session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        else:
+            if intra_threads:
+                torch.set_num_threads(intra_threads)
+            if inter_threads:
+                try:
+                    torch.set_num_interop_threads(inter_threads)
+                except RuntimeError:
+                    # 연산 간 스레드 풀은 프로세스에서 처음 병렬 작업 전에만 바꿀 수 있음
+                    pass
+            self._module = torch.jit.load(path, map_location="cpu")
+
+    @property
+    def head(self):
+        return "direct" if self.horizon > 1 else "autoregressive"
+
+    @property
+    def window(self):
+        return self.patch_size * self.n_patches
+
+    def __call__(self, x):
+        """x: (B, window, input_dim) CPU 텐서 -> autoregressive: (B,), direct: (B, horizon)"""
+        if self.format == "torchscript":
+            return self._module(x)
+        inputs = np.ascontiguousarray(x.numpy(), dtype=np.float32)
+        return torch.from_numpy(self._session.run(None, {"x": inputs})[0])
+
+
+def load_predictor(path, intra_threads=None, inter_threads=None):
+    """
+    확장자로 예측기 선택 -> (모델 또는 엔진, 메타데이터)
+    .pt/.ts: TorchScript 엔진, .onnx: ONNX Runtime 엔진, 그 외(.pth): eager PatchTST 체크포인트
+    """
+    if os.path.splitext(path)[1] in SUFFIXES:
+        engine = PatchTSTEngine(path, intra_threads, inter_threads)
+        return engine, engine.metadata
+    intra_threads = int(os.getenv("PATCHTST_INTRA_THREADS", "0")) if intra_threads is None else intra_threads
+    if intra_threads:
+        torch.set_num_threads(intra_threads)
+    return load_checkpoint(path)
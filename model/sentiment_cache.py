@@ -0,0 +1,125 @@
+# model/sentiment_cache.py
+"""
+감정분석 결과 캐시
+(모델명, 엔티티명, 분석 문맥 해시)를 키로 하는 LRU 캐시, 선택적으로 디스크에 저장
+"""
+
+import os
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentCache:
+    """크기/TTL 제한이 있는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_size=10000, ttl_seconds=86400, path=None, save_every=500):
+        """
+        max_size: 최대 항목 수 (초과 시 가장 오래 안 쓴 항목부터 제거)
+        ttl_seconds: 항목 유효 시간 (0이면 만료 없음)
+        path: 지정 시 이 파일에 pickle로 저장/복원
+        save_every: 새 항목이 이 개수만큼 쌓일 때마다 디스크에 저장
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.save_every = save_every
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (저장 시각, 값)
+        self._lock = threading.Lock()
+        self._unsaved = 0
+
+    @staticmethod
+    def make_key(model_name, entity_name, context):
+        digest = hashlib.sha256(context.encode("utf-8")).hexdigest()
+        return (model_name, entity_name, digest)
+
+    def _expired(self, stored_at, now):
+        return self.ttl_seconds > 0 and now - stored_at > self.ttl_seconds
+
+    def get(self, key):
+        """캐시 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry[0], time.time()):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self._unsaved += 1
+            should_save = self.path and self._unsaved >= self.save_every
+        if should_save:
+            self.save()
+
+    def clear(self):
+        """전체 무효화 (모델이 바뀐 경우 등)"""
+        with self._lock:
+            self._entries.clear()
+            self._unsaved += 1
+        if self.path:
+            self.save()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "persistent": bool(self.path)
+            }
+
+    def load(self):
+        """디스크에서 복원 (만료 항목은 제외)"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "rb") as f:
+                entries = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ 캐시 파일 로딩 실패 ({self.path}): {e}")
+            return 0
+
+        now = time.time()
+        with self._lock:
+            for key, (stored_at, value) in entries.items():
+                if not self._expired(stored_at, now):
+                    self._entries[key] = (stored_at, value)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return len(self._entries)
+
+    def save(self):
+        """디스크에 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.path:
+            return
+        with self._lock:
+            entries = OrderedDict(self._entries)
+            self._unsaved = 0
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"⚠️ 캐시 파일 저장 실패 ({self.path}): {e}")
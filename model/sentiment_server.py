@@ -6,17 +6,33 @@
 모델을 한 번만 로딩하고 상주시켜 빠른 분석 제공
 """
 
-from flask import Flask, request, jsonify
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+from flask import Flask, request, jsonify, g, Response, stream_with_context
+from werkzeug.serving import make_server
+from transformers import pipeline
 import torch
 import logging
 import sys
 import os
 import json
+import time
+import atexit
+import gc
+import signal
+import socket
+import glob
+import shutil
+import tempfile
 from datetime import datetime
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from model.micro_batcher import MicroBatcher
+from model.entity_context import extract_entity_contexts
+from model.sentiment_cache import SentimentCache
+from model.serving_metrics import MetricsRegistry, SIZE_BUCKETS
+from model.model_runtime import load_hf_model
+
 # 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(process)d - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
@@ -25,100 +41,338 @@ app = Flask(__name__)
 sentiment_analyzer = None
 tokenizer = None
 model = None
+model_name = None
+model_backend = None
+
+# 결과 캐시 설정: 최대 항목 수, 유효 시간(초), 저장 경로(비우면 메모리 전용)
+CACHE_MAX_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "10000"))
+CACHE_TTL_SECONDS = int(os.getenv("SENTIMENT_CACHE_TTL", "86400"))
+CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH") or None
+
+# 서버 설정: SENTIMENT_WORKERS > 1 이면 모델 로딩 후 워커 프로세스를 fork
+SERVER_HOST = os.getenv("SENTIMENT_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SENTIMENT_PORT", "5555"))
+NUM_WORKERS = int(os.getenv("SENTIMENT_WORKERS", "1"))
+TORCH_THREADS = int(os.getenv("SENTIMENT_TORCH_THREADS", "0"))  # 0이면 코어 수 / 워커 수
+# pre-fork 모드 지표 공유 디렉터리 (비우면 임시 디렉터리), 워커별 지표 기록 주기(초)
+METRICS_DIR = os.getenv("SENTIMENT_METRICS_DIR") or None
+METRICS_INTERVAL = float(os.getenv("SENTIMENT_METRICS_INTERVAL", "5"))
+
+result_cache = SentimentCache(max_size=CACHE_MAX_SIZE, ttl_seconds=CACHE_TTL_SECONDS, path=CACHE_PATH)
+
+# 서빙 지표 (/metrics)
+metrics = MetricsRegistry()
+REQUEST_COUNT = metrics.counter("sentiment_http_requests_total", "HTTP 요청 수", ("route", "method", "status"))
+REQUEST_LATENCY = metrics.histogram("sentiment_http_request_duration_seconds", "HTTP 요청 처리 시간", ("route", "method"))
+STAGE_LATENCY = metrics.histogram("sentiment_stage_duration_seconds", "단계별 처리 시간 (context/tokenize/forward/postprocess)", ("stage",))
+INFERENCE_BATCH_TEXTS = metrics.histogram("sentiment_inference_batch_texts", "추론 호출 1회당 텍스트 수 (요청 병합 후)", buckets=SIZE_BUCKETS)
+FORWARD_BATCH_SIZE = metrics.histogram("sentiment_forward_batch_size", "forward 1회당 배치 크기", buckets=SIZE_BUCKETS)
+MODEL_LOAD_SECONDS = metrics.gauge("sentiment_model_load_seconds", "모델 로딩 소요 시간")
+MODEL_INFO = metrics.gauge("sentiment_model_info", "로딩된 모델", ("model_name", "backend"))
+metrics.gauge("sentiment_cache_size", "결과 캐시 항목 수").set_function(lambda: result_cache.stats()["size"])
+metrics.counter("sentiment_cache_hits_total", "결과 캐시 적중 수").set_function(lambda: result_cache.hits)
+metrics.counter("sentiment_cache_misses_total", "결과 캐시 미적중 수").set_function(lambda: result_cache.misses)
 
 def load_model():
     """감정분석 모델 로딩"""
-    global sentiment_analyzer, tokenizer, model
+    global sentiment_analyzer, tokenizer, model, model_name, model_backend
     
     try:
         logger.info("🔄 감정분석 모델 로딩 시작...")
+        load_started = time.perf_counter()
         
         # 1차 모델: 한국 금융특화 모델
         model_name = "krevas/finance-koelectra-small-discriminator"
         
+        # 백엔드(eager/int8/onnx)는 MODEL_BACKEND_SENTIMENT 또는 MODEL_BACKEND로 선택
+        use_gpu = torch.cuda.is_available()
+        
         try:
-            tokenizer = AutoTokenizer.from_pretrained(model_name)
-            model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            tokenizer, model, model_backend = load_hf_model(
+                model_name, "sequence-classification", component="sentiment",
+                device="cuda" if use_gpu else None  # GPU 사용 가능하면 사용 (eager 전용)
+            )
             sentiment_analyzer = pipeline(
                 "text-classification",
                 model=model,
                 tokenizer=tokenizer,
-                device=0 if torch.cuda.is_available() else -1  # GPU 사용 가능하면 사용
+                device=0 if use_gpu and model_backend == "eager" else -1
             )
-            logger.info(f"✅ 1차 모델 로딩 성공: {model_name}")
+            logger.info(f"✅ 1차 모델 로딩 성공: {model_name} ({model_backend})")
             
         except Exception as e:
             logger.warning(f"⚠️ 1차 모델 실패: {e}")
             # 2차 모델: 대체 모델
             model_name = "Copycats/koelectra-base-v3-generalized-sentiment-analysis"
-            tokenizer = AutoTokenizer.from_pretrained(model_name)
-            model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            tokenizer, model, model_backend = load_hf_model(
+                model_name, "sequence-classification", component="sentiment",
+                device="cuda" if use_gpu else None
+            )
             sentiment_analyzer = pipeline(
                 "text-classification",
                 model=model,
                 tokenizer=tokenizer,
-                device=0 if torch.cuda.is_available() else -1
+                device=0 if use_gpu and model_backend == "eager" else -1
             )
-            logger.info(f"✅ 2차 모델 로딩 성공: {model_name}")
+            logger.info(f"✅ 2차 모델 로딩 성공: {model_name} ({model_backend})")
+            
+            # 모델이 바뀌었으므로 기존 분석 결과 무효화
+            result_cache.clear()
+            logger.info("🧹 대체 모델 사용으로 결과 캐시 초기화")
             
+        MODEL_LOAD_SECONDS.set(round(time.perf_counter() - load_started, 3))
+        MODEL_INFO.set(1, model_name=model_name, backend=model_backend)
         logger.info("🚀 모델 로딩 완료! 서버 준비됨")
         
     except Exception as e:
         logger.error(f"❌ 모델 로딩 실패: {e}")
         raise e
 
-def analyze_sentiment_for_entity(entity_name, entity_type, content):
-    """개별 엔티티에 대한 감정분석"""
-    try:
-        # 엔티티와 관련된 문맥 추출
-        sentences = content.split('.')
-        relevant_sentences = []
+# 배치 추론 설정 (환경변수로 조정 가능)
+MAX_BATCH_SIZE = int(os.getenv("SENTIMENT_MAX_BATCH_SIZE", "32"))
+MAX_SEQ_LENGTH = int(os.getenv("SENTIMENT_MAX_SEQ_LENGTH", "512"))
+
+# 요청 간 마이크로 배칭 설정: 최대 대기 시간(ms) 또는 모인 텍스트 수에 도달하면 추론
+BATCH_WAIT_MS = float(os.getenv("SENTIMENT_BATCH_WAIT_MS", "10"))
+BATCH_MAX_TEXTS = int(os.getenv("SENTIMENT_BATCH_MAX_TEXTS", "64"))
+
+# 엔티티 풀링 모드: 긴 기사를 윈도우로 나눌 때 겹치는 토큰 수
+POOLED_STRIDE = int(os.getenv("SENTIMENT_POOLED_STRIDE", "128"))
+ANALYSIS_MODES = ("context", "pooled")
+
+# 대량 분석(/analyze/bulk): 한 번에 읽어 함께 추론할 기사 수 (메모리 상한)
+BULK_CHUNK_ARTICLES = int(os.getenv("SENTIMENT_BULK_CHUNK_ARTICLES", "32"))
+
+def build_entity_contexts(entity_names, content):
+    """엔티티별 분석 텍스트 구성 (문장 분리와 이름 탐색은 본문당 한 번)"""
+    contexts = extract_entity_contexts(content, entity_names)
+    return {name: f"{name}: {context}" for name, context in contexts.items()}
+
+def normalize_label(label):
+    """모델 라벨을 +, -, 0 으로 표준화"""
+    sentiment_label = str(label).upper()
+    if sentiment_label in ['POSITIVE', 'POS', '1']:
+        return "+"
+    if sentiment_label in ['NEGATIVE', 'NEG', '0']:
+        return "-"
+    return "0"  # 중립
+
+def predict_texts(texts):
+    """
+    여러 텍스트를 한 번에 추론
+    - 토큰 길이순으로 정렬해 비슷한 길이끼리 묶어 패딩 최소화
+    - MAX_BATCH_SIZE 단위로 forward 후 원래 순서로 (label, score) 반환
+    """
+    if not texts:
+        return []
+    INFERENCE_BATCH_TEXTS.observe(len(texts))
+    
+    with STAGE_LATENCY.time(stage="tokenize"):
+        encodings = tokenizer(texts, truncation=True, max_length=MAX_SEQ_LENGTH)
+    order = sorted(range(len(texts)), key=lambda i: len(encodings['input_ids'][i]))
+    device = model.device
+    outputs = [None] * len(texts)
+    
+    for start in range(0, len(order), MAX_BATCH_SIZE):
+        bucket = order[start:start + MAX_BATCH_SIZE]
+        FORWARD_BATCH_SIZE.observe(len(bucket))
         
-        for sentence in sentences:
-            if entity_name in sentence:
-                relevant_sentences.append(sentence.strip())
+        with STAGE_LATENCY.time(stage="tokenize"):
+            features = {key: [encodings[key][i] for i in bucket] for key in encodings.keys()}
+            batch = tokenizer.pad(features, return_tensors='pt')
+            batch = {key: value.to(device) for key, value in batch.items()}
         
-        # 관련 문맥이 없으면 전체 내용 사용
-        if not relevant_sentences:
-            context = content[:200]  # 처음 200자만 사용
-        else:
-            context = '. '.join(relevant_sentences[:2])  # 최대 2문장
+        with STAGE_LATENCY.time(stage="forward"), torch.inference_mode():
+            logits = model(**batch).logits
         
-        # 분석 텍스트 구성
-        analysis_text = f"{entity_name}: {context}"
+        with STAGE_LATENCY.time(stage="postprocess"):
+            scores, label_ids = torch.softmax(logits, dim=-1).max(dim=-1)
+            for i, score, label_id in zip(bucket, scores.tolist(), label_ids.tolist()):
+                outputs[i] = (model.config.id2label[label_id], score)
+    
+    return outputs
+
+def find_entity_spans(entity_name, content):
+    """본문에서 엔티티가 등장하는 모든 문자 구간"""
+    spans = []
+    start = content.find(entity_name)
+    while start != -1:
+        spans.append((start, start + len(entity_name)))
+        start = content.find(entity_name, start + 1)
+    return spans
+
+def predict_entities_pooled(entity_names, content):
+    """
+    기사를 윈도우 단위로 한 번만 인코딩하고 엔티티별로 점수 계산
+    - 엔티티가 등장하는 토큰 구간의 hidden state를 평균 내어 분류 헤드에 통과
+    - 분류 헤드는 ELECTRA처럼 (batch, seq, hidden)의 첫 토큰을 입력으로 받는 형태를 가정
+    - 본문에 등장하지 않는 엔티티는 결과 dict에서 빠짐
+    """
+    spans = {name: find_entity_spans(name, content) for name in set(entity_names)}
+    spans = {name: found for name, found in spans.items() if found}
+    if not spans:
+        return {}
+    
+    with STAGE_LATENCY.time(stage="tokenize"):
+        encodings = tokenizer(
+            content,
+            truncation=True,
+            max_length=MAX_SEQ_LENGTH,
+            stride=POOLED_STRIDE,
+            return_overflowing_tokens=True,
+            return_offsets_mapping=True,
+            padding=True,
+            return_tensors='pt'
+        )
+    offsets = encodings.pop('offset_mapping').tolist()
+    encodings.pop('overflow_to_sample_mapping', None)
+    device = model.device
+    
+    FORWARD_BATCH_SIZE.observe(len(offsets))
+    
+    with torch.inference_mode():
+        with STAGE_LATENCY.time(stage="forward"):
+            hidden = model.base_model(**{key: value.to(device) for key, value in encodings.items()}).last_hidden_state
         
-        # 감정분석 실행
-        result = sentiment_analyzer(analysis_text[:512])  # 토큰 제한
+        postprocess_started = time.perf_counter()
+        names, pooled = [], []
+        for name, entity_spans in spans.items():
+            vectors = []
+            for window, window_offsets in enumerate(offsets):
+                token_ids = [
+                    t for t, (start, end) in enumerate(window_offsets)
+                    if end > start and any(start < span_end and end > span_start for span_start, span_end in entity_spans)
+                ]
+                if token_ids:
+                    vectors.append(hidden[window, token_ids])
+            if vectors:
+                names.append(name)
+                pooled.append(torch.cat(vectors).mean(dim=0))
         
-        # 결과 해석
-        sentiment_label = result[0]['label'].upper()
-        confidence_score = float(result[0]['score']) * 100
+        if not pooled:
+            return {}
+        logits = model.classifier(torch.stack(pooled).unsqueeze(1)).reshape(len(pooled), -1)
+        scores, label_ids = torch.softmax(logits, dim=-1).max(dim=-1)
+        STAGE_LATENCY.observe(time.perf_counter() - postprocess_started, stage="postprocess")
+    
+    return {
+        name: (model.config.id2label[label_id], score)
+        for name, score, label_id in zip(names, scores.tolist(), label_ids.tolist())
+    }
+
+# 모든 요청 스레드가 공유하는 단일 추론 워커
+batcher = MicroBatcher(predict_texts, max_batch_texts=BATCH_MAX_TEXTS, max_wait_ms=BATCH_WAIT_MS)
+metrics.gauge("sentiment_batch_queue_depth", "추론 워커 대기 요청 수").set_function(batcher.qsize)
+
+def infer(texts):
+    """워커가 실행 중이면 큐를 통해, 아니면 현재 스레드에서 바로 추론"""
+    if batcher.running:
+        return batcher.submit(texts).result()
+    return predict_texts(texts)
+
+def make_result(entity_name, entity_type, label=None, score=0.0):
+    """분석 결과 dict 구성 (label이 없으면 중립/0점)"""
+    return {
+        "entity_name": entity_name,
+        "entity_type": entity_type,
+        "sentiment": normalize_label(label) if label is not None else "0",
+        "confidence_score": round(float(score) * 100, 1)
+        # reasoning 제거 - 개별주/테마/산업에는 불필요
+    }
+
+def analyze_articles(articles, raise_errors=False):
+    """
+    여러 기사의 엔티티 감정분석
+    articles: (entities, content, mode) 목록, 기사별 결과 리스트를 같은 순서로 반환
+    raise_errors: 문맥 추출/추론 실패 시 중립 결과 대신 예외 전달 (대량 분석에서 실패한 기사를 구분할 때 사용)
+    - context: 엔티티별 문맥을 만들어 분석
+    - pooled: 기사를 한 번만 인코딩해 엔티티 토큰 구간으로 점수 계산,
+      본문에 등장하지 않는 엔티티만 context 방식으로 처리
+    - 모든 기사에서 캐시에 없는 문맥을 모아 한 번의 추론 호출로 처리
+    """
+    targets_per_article = []
+    predictions_per_article = []
+    pending = []  # (기사 index, 엔티티명, 캐시 키, 분석 텍스트)
+    
+    for index, (entities, content, mode) in enumerate(articles):
+        targets = []
+        for entity in entities:
+            entity_name = entity.get('name', '')
+            entity_type = entity.get('type', 'unknown')
+            if entity_name:
+                targets.append((entity_name, entity_type))
         
-        # 라벨 표준화
-        if sentiment_label in ['POSITIVE', 'POS', '1']:
-            sentiment = "+"
-        elif sentiment_label in ['NEGATIVE', 'NEG', '0']:
-            sentiment = "-"
-        else:
-            sentiment = "0"  # 중립
+        predictions = {}
+        # ONNX 백엔드는 hidden state와 분류 헤드를 따로 쓸 수 없어 context 방식으로 처리
+        if mode == "pooled" and model_backend != "onnx":
+            try:
+                predictions = predict_entities_pooled([name for name, _ in targets], content)
+            except Exception as e:
+                logger.warning(f"풀링 모드 실패, 문맥 방식으로 대체: {e}")
         
-        return {
-            "entity_name": entity_name,
-            "entity_type": entity_type,
-            "sentiment": sentiment,
-            "confidence_score": round(confidence_score, 1)
-            # reasoning 제거 - 개별주/테마/산업에는 불필요
-        }
+        missing = list(dict.fromkeys(name for name, _ in targets if name not in predictions))
+        try:
+            with STAGE_LATENCY.time(stage="context"):
+                contexts = build_entity_contexts(missing, content)
+            
+            # 캐시에 있는 엔티티는 추론에서 제외
+            for name in missing:
+                key = SentimentCache.make_key(f"{model_name}@{model_backend}", name, contexts[name])
+                cached = result_cache.get(key)
+                if cached is not None:
+                    predictions[name] = cached
+                else:
+                    pending.append((index, name, key, contexts[name]))
+        except Exception as e:
+            logger.error(f"문맥 추출 실패 ({len(missing)}개 엔티티): {e}")
+            if raise_errors:
+                raise
         
+        targets_per_article.append(targets)
+        predictions_per_article.append(predictions)
+    
+    try:
+        outputs = infer([text for _, _, _, text in pending])
+        for (index, name, key, _), prediction in zip(pending, outputs):
+            predictions_per_article[index][name] = prediction
+            result_cache.set(key, prediction)
     except Exception as e:
-        logger.error(f"엔티티 '{entity_name}' 분석 실패: {e}")
-        return {
-            "entity_name": entity_name,
-            "entity_type": entity_type,
-            "sentiment": "0",
-            "confidence_score": 0
-            # reasoning 제거 - 개별주/테마/산업에는 불필요
-        }
+        logger.error(f"배치 추론 실패 ({len(pending)}개 문맥): {e}")
+        if raise_errors:
+            raise
+    
+    return [
+        [
+            make_result(name, entity_type, *predictions[name]) if name in predictions else make_result(name, entity_type)
+            for name, entity_type in targets
+        ]
+        for targets, predictions in zip(targets_per_article, predictions_per_article)
+    ]
+
+def analyze_entities(entities, content, mode="context"):
+    """단일 기사 엔티티 감정분석"""
+    return analyze_articles([(entities, content, mode)])[0]
+
+def analyze_sentiment_for_entity(entity_name, entity_type, content, mode="context"):
+    """개별 엔티티에 대한 감정분석"""
+    return analyze_entities([{"name": entity_name, "type": entity_type}], content, mode)[0]
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    REQUEST_COUNT.inc(route=route, method=request.method, status=str(response.status_code))
+    if hasattr(g, "request_started"):
+        REQUEST_LATENCY.observe(time.perf_counter() - g.request_started, route=route, method=request.method)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus 텍스트 포맷 지표"""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -126,6 +380,16 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "model_loaded": sentiment_analyzer is not None,
+        "batching": {
+            "worker_running": batcher.running,
+            "queue_depth": batcher.qsize(),
+            "max_batch_texts": BATCH_MAX_TEXTS,
+            "max_wait_ms": BATCH_WAIT_MS
+        },
+        "model_name": model_name,
+        "model_backend": model_backend,
+        "worker_pid": os.getpid(),
+        "cache": result_cache.stats(),
         "timestamp": datetime.now().isoformat()
     })
 
@@ -140,24 +404,17 @@ def analyze_sentiment():
         
         entities = data.get('entities', [])
         content = data.get('content', '')
+        mode = data.get('mode', 'context')
         
         if not entities or not content:
             return jsonify({"success": False, "error": "entities와 content가 필요합니다"}), 400
+        if mode not in ANALYSIS_MODES:
+            return jsonify({"success": False, "error": f"mode는 {ANALYSIS_MODES} 중 하나여야 합니다"}), 400
         
-        logger.info(f"📊 배치 분석 시작: {len(entities)}개 엔티티")
-        
-        results = []
+        logger.info(f"📊 배치 분석 시작: {len(entities)}개 엔티티 (mode={mode})")
         
-        # 🔥 배치 처리: 모든 엔티티를 한번에 처리
-        for entity in entities:
-            entity_name = entity.get('name', '')
-            entity_type = entity.get('type', 'unknown')
-            
-            if not entity_name:
-                continue
-                
-            result = analyze_sentiment_for_entity(entity_name, entity_type, content)
-            results.append(result)
+        # 🔥 배치 처리: 모든 엔티티 문맥을 한 번의 forward로 처리
+        results = analyze_entities(entities, content, mode)
         
         logger.info(f"✅ 배치 분석 완료: {len(results)}개 결과")
         
@@ -176,6 +433,101 @@ def analyze_sentiment():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+def parse_bulk_article(line):
+    """NDJSON 한 줄을 (entities, content, mode)로 변환, 잘못된 입력은 ValueError"""
+    article = json.loads(line)
+    if not isinstance(article, dict):
+        raise ValueError("각 줄은 JSON 객체여야 합니다")
+    entities = article.get('entities', [])
+    content = article.get('content', '')
+    mode = article.get('mode', 'context')
+    if not entities or not content:
+        raise ValueError("entities와 content가 필요합니다")
+    if not isinstance(content, str):
+        raise ValueError("content는 문자열이어야 합니다")
+    if not isinstance(entities, list) or not all(
+        isinstance(entity, dict) and isinstance(entity.get('name'), str) and entity['name']
+        for entity in entities
+    ):
+        raise ValueError("entities는 name(문자열)을 가진 객체 목록이어야 합니다")
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"mode는 {ANALYSIS_MODES} 중 하나여야 합니다")
+    return article.get('id'), (entities, content, mode)
+
+def analyze_bulk_chunk(articles):
+    """
+    대량 분석 청크를 한 번에 분석해 기사별 (결과, 오류) 목록 반환
+    청크 분석이 실패하면 기사별로 다시 분석해 실패한 기사만 오류로 표시 (나머지 기사는 정상 결과)
+    """
+    try:
+        return [(results, None) for results in analyze_articles(articles, raise_errors=True)]
+    except Exception as e:
+        logger.error(f"❌ 대량 분석 청크 실패 ({len(articles)}건), 기사별로 다시 분석: {e}")
+    
+    outputs = []
+    for article in articles:
+        try:
+            outputs.append((analyze_articles([article], raise_errors=True)[0], None))
+        except Exception as e:
+            outputs.append((None, f"분석 실패: {e}"))
+    return outputs
+
+@app.route('/analyze/bulk', methods=['POST'])
+def analyze_bulk():
+    """
+    대량 감정분석 API (NDJSON 스트리밍)
+    - 요청: 한 줄에 기사 하나 {"id": ..., "content": "...", "entities": [...], "mode": "context"}
+    - 응답: 기사별 결과를 입력 순서대로 한 줄씩 스트리밍
+    - BULK_CHUNK_ARTICLES개씩 읽어 문맥을 모아 추론하므로 메모리 사용량은 전체 입력 크기와 무관
+    """
+    stream = request.stream
+    
+    def read_chunks():
+        chunk = []
+        for line_no, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            chunk.append((line_no, line))
+            if len(chunk) >= BULK_CHUNK_ARTICLES:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def generate():
+        total = 0
+        for chunk in read_chunks():
+            parsed = []
+            for line_no, line in chunk:
+                try:
+                    article_id, article = parse_bulk_article(line)
+                    parsed.append((line_no, article_id, article, None))
+                except ValueError as e:
+                    parsed.append((line_no, None, None, str(e)))
+            
+            # 분석에 실패한 기사는 오류 줄로 응답하고 스트림은 계속 진행
+            results = iter(analyze_bulk_chunk([article for _, _, article, error in parsed if error is None]))
+            for line_no, article_id, article, error in parsed:
+                if error is None:
+                    article_results, error = next(results)
+                if error is None:
+                    output = {
+                        "id": article_id,
+                        "line": line_no,
+                        "success": True,
+                        "results": article_results,
+                        "total_processed": len(article_results)
+                    }
+                else:
+                    output = {"id": article_id, "line": line_no, "success": False, "error": error}
+                yield json.dumps(output, ensure_ascii=False) + "\n"
+            
+            total += len(parsed)
+        logger.info(f"📦 대량 분석 완료: {total}건")
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/analyze/single', methods=['POST'])
 def analyze_single():
     """단일 엔티티 감정분석 API"""
@@ -185,11 +537,14 @@ def analyze_single():
         entity_name = data.get('entity_name', '')
         entity_type = data.get('entity_type', 'unknown')
         content = data.get('content', '')
+        mode = data.get('mode', 'context')
         
         if not entity_name or not content:
             return jsonify({"success": False, "error": "entity_name과 content가 필요합니다"}), 400
+        if mode not in ANALYSIS_MODES:
+            return jsonify({"success": False, "error": f"mode는 {ANALYSIS_MODES} 중 하나여야 합니다"}), 400
         
-        result = analyze_sentiment_for_entity(entity_name, entity_type, content)
+        result = analyze_sentiment_for_entity(entity_name, entity_type, content, mode)
         
         return jsonify({
             "success": True,
@@ -205,24 +560,141 @@ def analyze_single():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+# ---------------------------
+# 멀티 프로세스 서빙 (pre-fork)
+# ---------------------------
+def share_model_weights():
+    """
+    fork 전에 가중치를 공유 메모리로 옮기고 현재 객체를 GC 추적에서 고정
+    워커가 가중치를 읽기만 하므로 copy-on-write 페이지 복사가 거의 일어나지 않음
+    """
+    try:
+        model.share_memory()
+    except Exception as e:
+        logger.warning(f"⚠️ 가중치 공유 메모리 이동 실패, fork CoW로만 공유: {e}")
+    gc.collect()
+    gc.freeze()
+
+def run_worker(sock, num_threads, index, metrics_dir):
+    """워커 프로세스: 스레드 예산 설정 후 공유 소켓에서 요청 처리"""
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    torch.set_num_threads(num_threads)
+    # /metrics는 어느 워커가 받아도 모든 워커 합산값을 응답
+    metrics.enable_multiprocess(metrics_dir, index, METRICS_INTERVAL)
+    batcher.start()
+    
+    server = make_server(SERVER_HOST, SERVER_PORT, app, threaded=True, fd=sock.fileno())
+    logger.info(f"👷 워커 시작 (torch 스레드 {num_threads}개)")
+    try:
+        server.serve_forever()
+    finally:
+        metrics.write_state()
+        result_cache.save()
+
+def serve_prefork(num_workers):
+    """
+    리스닝 소켓을 하나 열고 워커 N개를 fork
+    - 커널이 공유 소켓의 accept를 워커들에 분산
+    - 워커가 죽으면 다시 띄우고, SIGTERM/SIGINT는 모든 워커에 전달
+    - /health와 결과 캐시는 워커별, /metrics는 워커별 지표 파일(METRICS_DIR)을 합산해 응답
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((SERVER_HOST, SERVER_PORT))
+    sock.listen(128)
+    sock.set_inheritable(True)
+    
+    share_model_weights()
+    num_threads = TORCH_THREADS or max(1, (os.cpu_count() or 1) // num_workers)
+    # 이전 실행의 워커 지표 파일은 지워서 카운터가 이번 실행부터 집계되도록 함
+    metrics_dir = METRICS_DIR or tempfile.mkdtemp(prefix="sentiment-metrics-")
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, "worker-*.json*")):
+        os.remove(path)
+    children = {}
+    stopping = False
+    
+    def spawn(index):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(sock, num_threads, index, metrics_dir)
+            except SystemExit:
+                pass
+            except Exception as e:
+                logger.error(f"💥 워커 오류: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = index
+    
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    for index in range(num_workers):
+        spawn(index)
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    logger.info(f"🧩 워커 {num_workers}개 시작 (워커당 torch 스레드 {num_threads}개)")
+    
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        index = children.pop(pid, None)
+        if index is not None and not stopping:
+            logger.warning(f"⚠️ 워커 종료 감지 (pid={pid}, status={status}), 재시작")
+            spawn(index)
+    
+    sock.close()
+    if not METRICS_DIR:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+    logger.info("👋 모든 워커 종료")
+
 if __name__ == '__main__':
     try:
         # 모델 로딩
+        if CACHE_PATH:
+            logger.info(f"💾 결과 캐시 복원: {result_cache.load()}개 항목 ({CACHE_PATH})")
         load_model()
         
         # 서버 시작
+        base_url = f"http://{SERVER_HOST}:{SERVER_PORT}"
         logger.info("🌟 Flask 감정분석 서버 시작")
-        logger.info("📍 URL: http://127.0.0.1:5555")
-        logger.info("📍 Health Check: http://127.0.0.1:5555/health")
-        logger.info("📍 API: POST http://127.0.0.1:5555/analyze")
-        
-        app.run(
-            host='127.0.0.1',
-            port=5555,
-            debug=False,  # 운영 환경에서는 False
-            threaded=True  # 다중 요청 처리
-        )
+        logger.info(f"📍 URL: {base_url}")
+        logger.info(f"📍 Health Check: {base_url}/health")
+        logger.info(f"📍 API: POST {base_url}/analyze")
+        logger.info(f"📍 Bulk API: POST {base_url}/analyze/bulk (NDJSON)")
+        logger.info(f"📍 Metrics: {base_url}/metrics")
+        
+        if NUM_WORKERS > 1:
+            serve_prefork(NUM_WORKERS)
+        else:
+            if CACHE_PATH:
+                atexit.register(result_cache.save)
+            if TORCH_THREADS:
+                torch.set_num_threads(TORCH_THREADS)
+            batcher.start()
+            logger.info(f"🧺 마이크로 배칭 워커 시작 (최대 {BATCH_MAX_TEXTS}개 / {BATCH_WAIT_MS}ms)")
+            
+            app.run(
+                host=SERVER_HOST,
+                port=SERVER_PORT,
+                debug=False,  # 운영 환경에서는 False
+                threaded=True  # 다중 요청 처리
+            )
         
     except Exception as e:
         logger.error(f"💥 서버 시작 실패: {e}")
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1) 
@@ -0,0 +1,267 @@
+# model/serving_metrics.py
+"""
+서빙 지표 수집 및 Prometheus 텍스트 포맷 출력
+카운터/게이지/히스토그램만 지원하는 최소 구현
+
+멀티 프로세스(pre-fork) 모드: 워커마다 지표 상태를 공유 디렉터리의 worker-<번호>.json에 주기적으로 기록하고,
+/metrics를 받은 워커가 모든 파일을 합쳐 응답 (카운터/히스토그램은 합산, 게이지는 worker 라벨로 구분)
+"""
+
+import os
+import glob
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# 지연 시간 히스토그램 기본 구간 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 배치 크기 히스토그램 기본 구간
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._function = None
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨은 {self.labelnames} 이어야 합니다")
+        return tuple((name, labels[name]) for name in self.labelnames)
+
+    def set_function(self, fn):
+        """조회 시점에 값을 계산하는 함수 지정 (라벨 없는 지표 전용)"""
+        self._function = fn
+        return self
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    def snapshot(self):
+        """현재 값 {라벨 키: 값}"""
+        if self._function is not None:
+            return {(): self._function()}
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._values.items()}
+
+    def restore(self, values):
+        """이전 프로세스가 남긴 값으로 시작 (재시작한 워커의 누적값 유지)"""
+        with self._lock:
+            self._values.update({key: self._copy(value) for key, value in values.items()})
+
+    def merge(self, states):
+        """워커별 [(워커, {라벨 키: 값})]를 합산"""
+        merged = {}
+        for _, values in states:
+            for key, value in values.items():
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def _samples(self, values):
+        return [(self.name, key, value) for key, value in values.items()]
+
+    def samples(self):
+        return self._samples(self.snapshot())
+
+    def render(self, values=None):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in self._samples(self.snapshot() if values is None else values):
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def merge(self, states):
+        """현재 값이므로 합산하지 않고 워커별로 구분"""
+        return {
+            key + (("worker", worker),): value
+            for worker, values in states
+            for key, value in values.items()
+        }
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 실행 시간을 초 단위로 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    @staticmethod
+    def _copy(state):
+        return dict(state, counts=list(state["counts"]))
+
+    def merge(self, states):
+        merged = {}
+        for _, values in states:
+            for key, state in values.items():
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = self._copy(state)
+                    continue
+                total["counts"] = [a + b for a, b in zip(total["counts"], state["counts"])]
+                total["sum"] += state["sum"]
+                total["count"] += state["count"]
+        return merged
+
+    def _samples(self, values):
+        samples = []
+        for key, state in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", key + (("le", _format_value(float(bound))),), cumulative))
+            samples.append((f"{self.name}_sum", key, state["sum"]))
+            samples.append((f"{self.name}_count", key, state["count"]))
+        return samples
+
+
+class MetricsRegistry:
+    """지표 등록 및 /metrics 응답 생성"""
+
+    def __init__(self):
+        self._metrics = []
+        self._directory = None
+        self._worker = None
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def _state_path(self, worker):
+        return os.path.join(self._directory, f"worker-{worker}.json")
+
+    def enable_multiprocess(self, directory, worker, interval=5.0):
+        """
+        워커 프로세스에서 호출: 지표 상태를 directory에 interval초마다 기록하고 render()는 모든 워커를 합산
+        같은 번호의 이전 워커가 남긴 카운터/히스토그램 값에서 이어서 집계 (재시작해도 값이 줄지 않음)
+        """
+        self._directory, self._worker = directory, str(worker)
+        for name, values in self._read_state(self._state_path(self._worker)).items():
+            for metric in self._metrics:
+                if metric.name == name and metric.kind in ("counter", "histogram") and metric._function is None:
+                    metric.restore(values)
+
+        def write_loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write_state()
+                except OSError:
+                    pass
+
+        threading.Thread(target=write_loop, name="metrics-writer", daemon=True).start()
+
+    def write_state(self):
+        """이 워커의 지표 상태를 파일로 기록 (임시 파일 후 교체하므로 읽는 쪽은 항상 완전한 파일을 봄)"""
+        if self._directory is None:
+            return
+        state = {
+            metric.name: [[[list(pair) for pair in key], value] for key, value in metric.snapshot().items()]
+            for metric in self._metrics
+        }
+        path = self._state_path(self._worker)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _read_state(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {
+            name: {tuple(tuple(pair) for pair in key): value for key, value in values}
+            for name, values in state.items()
+        }
+
+    def render(self):
+        lines = []
+        if self._directory is None:
+            for metric in self._metrics:
+                lines.extend(metric.render())
+            return "\n".join(lines) + "\n"
+
+        # 자기 상태를 먼저 기록한 뒤 모든 워커 파일을 합산
+        self.write_state()
+        states = []
+        for path in sorted(glob.glob(os.path.join(self._directory, "worker-*.json"))):
+            worker = os.path.basename(path)[len("worker-"):-len(".json")]
+            states.append((worker, self._read_state(path)))
+        for metric in self._metrics:
+            lines.extend(metric.render(metric.merge([(worker, state.get(metric.name, {})) for worker, state in states])))
+        return "\n".join(lines) + "\n"
@@ -1,41 +1,34 @@
+# model/stock_prediction.py
+# PatchTST 30일 종가 예측
+# - 다른 코드에서: Predictor를 한 번 만들어 두고 predict()/predict_batches()/run() 반복 호출
+# - 야간 작업: python model/stock_prediction.py [--full-rebuild] [--checkpoint model.onnx]
 
-import torch
-import torch.nn as nn
 import pandas as pd
 import numpy as np
 import psycopg2
+from psycopg2.extras import execute_values
 from datetime import datetime
 from dotenv import load_dotenv
 import os
+import io
+import sys
+import hashlib
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# 모델 클래스 정의
-import torch.nn as nn
-
-class PatchTST(nn.Module):
-    def __init__(self, input_dim, patch_size, n_patches, d_model, n_heads, num_layers):
-        super().__init__()
-        self.patch_size = patch_size
-        self.input_dim = input_dim
-        self.n_patches = n_patches
-        self.d_model = d_model
-
-        self.patch_embedding = nn.Linear(patch_size * input_dim, d_model)
-        encoder_layer = nn.TransformerEncoderLayer(d_model=d_model, nhead=n_heads, batch_first=True)
-        self.transformer = nn.TransformerEncoder(encoder_layer, num_layers=num_layers)
-        self.regressor = nn.Linear(d_model, 1)
-
-    def forward(self, x):
-        # x: (batch_size, seq_len, input_dim)
-        B, L, D = x.shape
-        x = x.reshape(B, self.n_patches, self.patch_size * D)  # patching
-        x = self.patch_embedding(x)  # (B, n_patches, d_model)
-        x = self.transformer(x)  # (B, n_patches, d_model)
-        x = x.mean(dim=1)  # Global average pooling
-        out = self.regressor(x).squeeze()
-        return out
+from model.patchtst import predict as predict_sequences, HORIZON
+from model.patchtst_engine import load_predictor
 
 load_dotenv()
 
+# 한 번에 예측할 종목 수 (메모리 사용량 제한)
+PREDICT_CHUNK_SIZE = int(os.getenv("PREDICT_CHUNK_SIZE", "4096"))
+# 예측 모델 체크포인트 (head는 체크포인트 메타데이터로 결정, 기존 파일은 autoregressive)
+# direct head: src/scripts/train_patchtst.py --head direct 로 만든 체크포인트 지정
+# .pt/.onnx: src/scripts/export_patchtst.py로 내보낸 엔진 (스레드는 PATCHTST_INTRA_THREADS/PATCHTST_INTER_THREADS)
+# 기본값은 실행 위치와 관계없이 이 모듈 옆의 체크포인트
+PREDICTION_CHECKPOINT = os.getenv("PREDICTION_CHECKPOINT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "stock_prediction_model.pth"))
+
 DB_CONFIG = {
     "host": os.getenv("DB_HOST"),
     "port": os.getenv("DB_PORT"),
@@ -44,121 +37,237 @@ DB_CONFIG = {
     "dbname": os.getenv("DB_NAME"),
 }
 
+RESULT_TABLE = "stock_prediction_result"
+STAGING_TABLE = "stock_prediction_result_staging"
+# 종목별 입력 지문 (입력 시퀀스 + 스케일러 min/max + 모델 버전), 바뀐 종목만 다시 예측
+FINGERPRINT_TABLE = "stock_prediction_fingerprint"
+
+FINGERPRINT_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE} (
+    stock_id INT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
 def connect_db():
     return psycopg2.connect(**DB_CONFIG)
 
-# DB 연결
-print("✅ DB 연결 중...")
-conn = connect_db()
-cur = conn.cursor()
-cur.execute("TRUNCATE TABLE stock_prediction_result;")
-print("⚠️ stock_prediction_result 테이블의 기존 데이터가 비워졌습니다.")
-
-# 1. 데이터 불러오기
-print("✅ 데이터 불러오는 중...")
-cur.execute("SELECT stock_id, " + ", ".join([f"close_{i}" for i in range(1, 31)]) + " FROM stock_close_sequence_scaled;")
-rows = cur.fetchall()
-print("✅ 데이터 불러오기 완료.")
-
-# 2. 데이터 전처리
-print("✅ 데이터 전처리 중...")
-df = pd.DataFrame(rows, columns=["stock_id"] + [f"close_{i}" for i in range(1, 31)])
-stock_ids = df["stock_id"]
-scaled_data = df.drop("stock_id", axis=1).values  # 이미 scaled된 데이터 사용
-scaled_data = scaled_data.reshape(scaled_data.shape[0], scaled_data.shape[1], 1)
-print(scaled_data.shape)  # (num_samples, 30, 1) 형태로 변환
-print("✅ 데이터 전처리 완료.")
-
-# 3. 모델 로딩
-print("✅ 모델 로딩 중...")
-# 하이퍼파라미터
-patch_size = 7  # 29를 n_patches=4, patch_size=7로 자를 수 있음
-n_patches = 29 // patch_size
-d_model = 64
-n_heads = 4
-num_layers = 2
-epochs = 100
-batch_size = 32
-lr = 0.001
-
-# 모델 초기화
-model = PatchTST(input_dim=1, patch_size=patch_size, n_patches=n_patches, d_model=d_model, n_heads=n_heads, num_layers=num_layers)
-model.load_state_dict(torch.load("./stock_prediction_model.pth"))  # 파라미터 로드
-model.eval()
-print("✅ 모델 로딩 완료.")
-
-# 4. 예측 함수 정의
-def sliding_predict(model, input_sequence):
+def load_sequences(cur):
+    """(stock_id 배열, scaled 종가 (종목 수, 30))"""
+    cur.execute("SELECT stock_id, " + ", ".join([f"close_{i}" for i in range(1, 31)]) + " FROM stock_close_sequence_scaled;")
+    df = pd.DataFrame(cur.fetchall(), columns=["stock_id"] + [f"close_{i}" for i in range(1, 31)])
+    return df["stock_id"].to_numpy(), df.drop("stock_id", axis=1).to_numpy(dtype=np.float64)  # 이미 scaled된 데이터 사용
+
+def load_scaler_info(cur):
+    cur.execute("SELECT stock_id, close_min, close_max FROM stock_scaler_info;")
+    return {row[0]: (float(row[1]), float(row[2])) for row in cur.fetchall()}
+
+def model_version(path):
+    """체크포인트/엔진 파일 내용 해시 (모델이 바뀌면 모든 종목 지문이 바뀜)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+def compute_fingerprints(stock_ids, sequences, bounds, version):
+    """종목별 sha256(입력 시퀀스, 스케일러 min/max, 모델 버전)"""
+    return [
+        hashlib.sha256(sequence.tobytes() + bound.tobytes() + version.encode()).hexdigest()
+        for sequence, bound in zip(np.ascontiguousarray(sequences), np.ascontiguousarray(bounds))
+    ]
+
+def load_fingerprints(cur):
+    cur.execute(FINGERPRINT_TABLE_SQL)
+    cur.execute(f"SELECT stock_id, fingerprint FROM {FINGERPRINT_TABLE};")
+    return dict(cur.fetchall())
+
+def inverse_scale(bounds, predictions_scaled):
+    """종목별 (min, max)로 scaled 예측 (종목 수, 30)을 한 번에 종가로 역변환"""
+    min_val, max_val = bounds[:, :1], bounds[:, 1:]
+    return predictions_scaled * (max_val - min_val) + min_val
+
+def copy_predictions(cur, table, stock_ids, predictions_scaled, predicted_close):
+    """(stock_id, predict_day, predicted_scaled, predicted_close) 행을 COPY FROM STDIN으로 적재"""
+    n_stocks, horizon = predictions_scaled.shape
+    frame = pd.DataFrame({
+        "stock_id": np.repeat(stock_ids, horizon),
+        "predict_day": np.tile(np.arange(1, horizon + 1), n_stocks),
+        "predicted_scaled": predictions_scaled.ravel(),
+        "predicted_close": predicted_close.ravel(),
+    })
+    buffer = io.StringIO()
+    frame.to_csv(buffer, sep="\t", header=False, index=False)
+    buffer.seek(0)
+    cur.copy_expert(
+        f"COPY {table} (stock_id, predict_day, predicted_scaled, predicted_close) FROM STDIN WITH (FORMAT text)",
+        buffer
+    )
+    return len(frame)
+
+def upsert_fingerprints(cur, stock_ids, fingerprints, version):
+    execute_values(cur, f"""
+        INSERT INTO {FINGERPRINT_TABLE} (stock_id, fingerprint, model_version, updated_at) VALUES %s
+        ON CONFLICT (stock_id) DO UPDATE
+        SET fingerprint = EXCLUDED.fingerprint, model_version = EXCLUDED.model_version, updated_at = EXCLUDED.updated_at
+    """, [(int(stock_id), fingerprint, version, datetime.now()) for stock_id, fingerprint in zip(stock_ids, fingerprints)])
+
+def replace_predictions(conn, stock_ids, predictions_scaled, predicted_close, fingerprints, version):
     """
-    model: 학습된 딥러닝 모델
-    input_sequence: 길이 30의 numpy array (원래의 close_1 ~ close_30, 이미 scaled된 상태)
+    전체 재계산 결과 저장
+    스테이징 테이블에 COPY로 적재한 뒤 한 트랜잭션에서 기존 테이블과 교체 -> API는 이전 결과 또는 새 결과 전체만 봄
     """
-    predictions_scaled = []
-
-    # 30일 예측
-    for _ in range(30):
-        # 슬라이딩 윈도우를 사용하여 28일 데이터로 변환
-        # 예를 들어, 마지막 28일을 사용하여 예측
-        X = torch.tensor(input_sequence[:, :patch_size * n_patches, :], dtype=torch.float32)  # X는 (samples, patch_size * n_patches, features) 형태
-        next_scaled = model(X).detach().numpy()  # 모델 예측 후 detach()로 그래디언트 계산에서 제외한 후 .numpy() 호출
-        predictions_scaled.append(next_scaled)
-
-        # 슬라이딩 윈도우: 새 예측 결과 추가
-        # input_sequence에서 첫 2일을 제외하고 예측값을 추가하여 최신 30일 데이터 유지
-        # next_scaled를 3차원 배열로 변환 (samples, 1, 1) 형태로 변경하여 추가
-        next_scaled_3d = next_scaled.reshape(-1, 1, 1)  # (samples, 1, 1)
-        input_sequence = np.append(input_sequence[:, 1:, :], next_scaled_3d, axis=1)
-
-    return predictions_scaled
-
-
-# 5. 예측 결과를 DB에 저장하는 함수
-input_sequence = scaled_data  # 각 종목의 30일 종가 데이터를 사용
-predictions_scaled = sliding_predict(model, input_sequence)  # 예측 수행
-print(np.array(predictions_scaled).shape)
-
-def save_predictions_to_db(stock_ids, predictions_scaled):
-    insert_sql = """
-    INSERT INTO stock_prediction_result (stock_id, predict_day, predicted_scaled, predicted_close)
-    VALUES (%s, %s, %s, %s)
-    ON CONFLICT (stock_id, predict_day) DO NOTHING;
+    with conn.cursor() as cur:
+        # 1) 스테이징 테이블에 적재 후 기본키 생성 (적재 후 인덱스를 만드는 편이 빠름)
+        cur.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE};")
+        cur.execute(f"CREATE TABLE {STAGING_TABLE} (LIKE {RESULT_TABLE} INCLUDING DEFAULTS);")
+        inserted = copy_predictions(cur, STAGING_TABLE, stock_ids, predictions_scaled, predicted_close)
+        cur.execute(f"ALTER TABLE {STAGING_TABLE} ADD CONSTRAINT {STAGING_TABLE}_pkey PRIMARY KEY (stock_id, predict_day);")
+        conn.commit()
+        print(f"✅ 스테이징 테이블에 {inserted}개 예측 결과 적재 완료.")
+
+        # 2) 한 트랜잭션에서 교체, 지문도 함께 갱신
+        cur.execute(f"DROP TABLE {RESULT_TABLE};")
+        cur.execute(f"ALTER TABLE {STAGING_TABLE} RENAME TO {RESULT_TABLE};")
+        cur.execute(f"ALTER TABLE {RESULT_TABLE} RENAME CONSTRAINT {STAGING_TABLE}_pkey TO {RESULT_TABLE}_pkey;")
+        cur.execute(f"DELETE FROM {FINGERPRINT_TABLE};")
+        upsert_fingerprints(cur, stock_ids, fingerprints, version)
+        conn.commit()
+    return inserted
+
+def upsert_predictions(conn, stock_ids, predictions_scaled, predicted_close, fingerprints, version, removed_ids):
+    """
+    바뀐 종목만 저장 (한 트랜잭션)
+    임시 테이블에 COPY한 뒤 결과 테이블에 upsert, 입력에서 빠진 종목의 예측/지문은 삭제
+    """
+    with conn.cursor() as cur:
+        cur.execute(f"CREATE TEMP TABLE {STAGING_TABLE}_changed (LIKE {RESULT_TABLE} INCLUDING DEFAULTS) ON COMMIT DROP;")
+        inserted = copy_predictions(cur, f"{STAGING_TABLE}_changed", stock_ids, predictions_scaled, predicted_close)
+        cur.execute(f"""
+            INSERT INTO {RESULT_TABLE} (stock_id, predict_day, predicted_scaled, predicted_close)
+            SELECT stock_id, predict_day, predicted_scaled, predicted_close FROM {STAGING_TABLE}_changed
+            ON CONFLICT (stock_id, predict_day) DO UPDATE
+            SET predicted_scaled = EXCLUDED.predicted_scaled, predicted_close = EXCLUDED.predicted_close;
+        """)
+        if removed_ids:
+            cur.execute(f"DELETE FROM {RESULT_TABLE} WHERE stock_id = ANY(%s);", (removed_ids,))
+            cur.execute(f"DELETE FROM {FINGERPRINT_TABLE} WHERE stock_id = ANY(%s);", (removed_ids,))
+        upsert_fingerprints(cur, stock_ids, fingerprints, version)
+        conn.commit()
+    return inserted
+
+
+class Predictor:
+    """
+    PatchTST 30일 종가 예측기
+    모델(체크포인트 또는 내보낸 엔진)을 한 번 불러와 메모리에 두고 여러 번 호출 (API 서버, 백테스트, 벤치마크 재사용)
+    - predict(): numpy 배열 -> scaled 예측
+    - predict_batches(): (stock_ids, 시퀀스) 묶음 iterator -> (stock_ids, scaled 예측) generator
+    - run(): DB의 바뀐 종목만 예측해 저장하는 야간 작업
     """
 
-    predictions_scaled = np.array(predictions_scaled, dtype=np.float32)
-
-    cur.execute("SELECT stock_id, close_min, close_max FROM stock_scaler_info;")
-    scaler_info = {row[0]: (float(row[1]), float(row[2])) for row in cur.fetchall()}
-    print(scaler_info)
-
-
-    inserted = 0
-    for i, stock_id in enumerate(stock_ids):
-
-        min_val, max_val = scaler_info[str(stock_id)]
-
-        for predict_day in range(30):
-            predicted_scaled = float(predictions_scaled[predict_day, i])
-            predicted_close = predicted_scaled * (max_val - min_val) + min_val
-
-            try:
-                cur.execute(insert_sql, (stock_id, predict_day + 1, predicted_scaled, predicted_close))
-                printf(f"✅ INSERT 성공 (stock_id={stock_id}, day={predict_day+1}): {predicted_scaled} -> {predicted_close}")
-                inserted += 1
-            except Exception as e:
-                conn.rollback()
-                print(f"❗ INSERT 실패 (stock_id={stock_id}, day={predict_day+1}): {e}")
-
-    conn.commit()
-    cur.close()
-    print(f"✅ {inserted}개 예측 결과 저장 완료.")
-
-
-save_predictions_to_db(stock_ids, predictions_scaled)  # 예측 결과 DB에 저장
-
-
-# 트랜잭션 커밋 및 DB 연결 종료
-conn.commit()
-cur.close()
-conn.close()
-
-print("✅ 모든 예측 결과가 DB에 저장되었습니다.")
+    def __init__(self, checkpoint=None, chunk_size=None, horizon=HORIZON, intra_threads=None, inter_threads=None):
+        self.checkpoint = checkpoint or PREDICTION_CHECKPOINT
+        self.chunk_size = chunk_size or PREDICT_CHUNK_SIZE
+        self.horizon = horizon
+        self.model, self.metadata = load_predictor(self.checkpoint, intra_threads, inter_threads)
+        self.version = model_version(self.checkpoint)
+
+    @property
+    def head(self):
+        return self.model.head
+
+    def predict(self, sequences):
+        """
+        sequences: (종목 수, 30) 또는 (종목 수, 30, 1) scaled 종가
+        반환: (종목 수, horizon) float32 scaled 예측 (autoregressive: 버퍼 기반 30회 추론, direct: 1회 추론)
+        """
+        return predict_sequences(self.model, sequences, self.horizon, self.chunk_size)
+
+    def predict_batches(self, batches):
+        """(stock_ids, 시퀀스) 묶음을 차례로 예측 -> (stock_ids, scaled 예측) 생성"""
+        for stock_ids, sequences in batches:
+            yield stock_ids, self.predict(sequences)
+
+    def forecast(self, sequences, bounds):
+        """scaled 예측과 종목별 (min, max)로 역변환한 종가 예측 -> (scaled, 종가)"""
+        predictions_scaled = self.predict(sequences)
+        return predictions_scaled, inverse_scale(np.asarray(bounds, dtype=np.float64).reshape(-1, 2), predictions_scaled)
+
+    def run(self, conn, full_rebuild=False):
+        """
+        stock_close_sequence_scaled의 종목을 예측해 stock_prediction_result에 저장
+        지문이 바뀐 종목만 예측/upsert, full_rebuild이거나 지문이 없으면(첫 실행) 전체 예측 후 테이블 교체
+        반환: {"changed", "skipped", "removed", "inserted"} 개수
+        """
+        # 1. 데이터 불러오기
+        print("✅ 데이터 불러오는 중...")
+        with conn.cursor() as cur:
+            stock_ids, scaled_data = load_sequences(cur)
+            scaler_info = load_scaler_info(cur)
+            previous_fingerprints = load_fingerprints(cur)
+        conn.commit()
+        print("✅ 데이터 불러오기 완료.")
+
+        # 2. 데이터 전처리
+        found = np.array([str(stock_id) in scaler_info for stock_id in stock_ids], dtype=bool)
+        if not found.all():
+            print(f"❗ 스케일러 정보 없음, 예측 제외: stock_id={stock_ids[~found].tolist()}")
+        stock_ids, scaled_data = stock_ids[found], scaled_data[found]
+        bounds = np.array([scaler_info[str(stock_id)] for stock_id in stock_ids], dtype=np.float64).reshape(-1, 2)
+        print(scaled_data.shape)  # (num_samples, 30)
+
+        # 3. 바뀐 종목 선택 (지문이 없으면 첫 실행으로 보고 전체 재계산)
+        fingerprints = compute_fingerprints(stock_ids, scaled_data, bounds, self.version)
+        full_rebuild = full_rebuild or not previous_fingerprints
+        if full_rebuild:
+            changed = np.ones(len(stock_ids), dtype=bool)
+        else:
+            changed = np.array([previous_fingerprints.get(int(stock_id)) != fingerprint
+                                for stock_id, fingerprint in zip(stock_ids, fingerprints)], dtype=bool)
+        current_ids = {int(stock_id) for stock_id in stock_ids}
+        removed_ids = [stock_id for stock_id in previous_fingerprints if stock_id not in current_ids]
+        print(f"✅ 예측 대상 {int(changed.sum())}/{len(stock_ids)}개 종목 (삭제 {len(removed_ids)}개, {'전체 재계산' if full_rebuild else '증분'})")
+
+        # 4. 예측 후 DB 저장
+        changed_fingerprints = [fingerprint for fingerprint, flag in zip(fingerprints, changed) if flag]
+        if changed.any():
+            predictions_scaled, predicted_close = self.forecast(scaled_data[changed], bounds[changed])  # (종목 수, 30)
+        else:
+            # 바뀐 종목이 없으면 추론 없이 삭제된 종목만 반영
+            predictions_scaled = predicted_close = np.empty((0, self.horizon), dtype=np.float32)
+        if full_rebuild:
+            inserted = replace_predictions(conn, stock_ids, predictions_scaled, predicted_close, fingerprints, self.version)
+        elif changed.any() or removed_ids:
+            inserted = upsert_predictions(conn, stock_ids[changed], predictions_scaled, predicted_close,
+                                          changed_fingerprints, self.version, removed_ids)
+        else:
+            inserted = 0
+        print(f"✅ {inserted}개 예측 결과 저장 완료. ({int(changed.sum())}개 종목)")
+        return {"changed": int(changed.sum()), "skipped": int((~changed).sum()), "removed": len(removed_ids), "inserted": inserted}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PatchTST 30일 종가 예측")
+    parser.add_argument("--full-rebuild", action="store_true", help="지문과 관계없이 모든 종목을 다시 예측하고 테이블 교체")
+    parser.add_argument("--checkpoint", default=PREDICTION_CHECKPOINT, help="체크포인트(.pth) 또는 내보낸 엔진(.pt/.onnx)")
+    parser.add_argument("--chunk-size", type=int, default=PREDICT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    print("✅ 모델 로딩 중...")
+    predictor = Predictor(args.checkpoint, args.chunk_size)
+    print(f"✅ 모델 로딩 완료. ({predictor.head} head, 버전 {predictor.version}, {predictor.metadata})")
+
+    print("✅ DB 연결 중...")
+    conn = connect_db()
+    try:
+        predictor.run(conn, full_rebuild=args.full_rebuild)
+    finally:
+        conn.close()
+    print("✅ 모든 예측 결과가 DB에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
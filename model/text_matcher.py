@@ -0,0 +1,84 @@
+# model/text_matcher.py
+"""
+다중 패턴 문자열 매칭 (Aho-Corasick)
+여러 이름을 텍스트 한 번 순회로 모두 찾기 위해 사용
+"""
+
+from collections import deque
+
+
+class AhoCorasick:
+    """패턴 목록으로 오토마톤을 만들고 텍스트에서 모든 등장 위치를 찾음"""
+
+    def __init__(self, patterns=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._patterns = [[]]  # 상태에서 끝나는 패턴 (add로만 변경)
+        self._output = [[]]  # 실패 링크 쪽 패턴까지 합친 출력 (build마다 다시 계산)
+        self._built = False
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern):
+        """패턴 추가 (빈 문자열과 중복은 무시)"""
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._patterns.append([])
+                self._output.append([])
+            state = next_state
+        if pattern not in self._patterns[state]:
+            self._patterns[state].append(pattern)
+        self._built = False
+
+    def build(self):
+        """실패 링크 계산 (BFS), build 후 add해도 다시 build하면 출력이 중복되지 않음"""
+        self._output = [list(patterns) for patterns in self._patterns]
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # 실패 링크 쪽 출력도 이 상태에서 함께 나오도록 합침
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+        self._built = True
+        return self
+
+    def iter(self, text):
+        """모든 매치를 (start, end, pattern)으로 반환 (겹치는 매치 포함, 끝 위치 순)"""
+        if not self._built:
+            self.build()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern in output[state]:
+                yield i + 1 - len(pattern), i + 1, pattern
+
+    def find_longest(self, text):
+        """겹치는 매치는 가장 앞에서 시작하는 가장 긴 패턴만 남김"""
+        matches = sorted(self.iter(text), key=lambda m: (m[0], -(m[1] - m[0])))
+        selected = []
+        last_end = 0
+        for start, end, pattern in matches:
+            if start >= last_end:
+                selected.append((start, end, pattern))
+                last_end = end
+        return selected
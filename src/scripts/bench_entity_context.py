@@ -0,0 +1,94 @@
+# src/scripts/bench_entity_context.py
+# 엔티티 문맥 추출 마이크로벤치마크
+# 기존 방식(엔티티마다 content.split('.') 후 전체 문장 스캔)과
+# 본문당 한 번 문장 분리 후 모든 엔티티 문맥을 함께 뽑는 방식을 비교
+#
+# python src/scripts/bench_entity_context.py --articles 500 --entities 15
+
+import sys
+import os
+import csv
+import time
+import random
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from model.entity_context import extract_entity_contexts
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+STOCK_CSV = os.path.join(BASE_DIR, "data", "stock_for_news.csv")
+
+FILLER = [
+    "{name}는 올해 2분기 영업이익이 전년 대비 12.5% 증가했다고 밝혔다.",
+    "증권가에서는 {name}의 목표주가를 상향 조정했다.",
+    "외국인 투자자들은 이날 {name} 주식을 대거 순매수했다.",
+    "시장 전문가들은 금리 인하 기대감이 반영된 것으로 분석했다.",
+    "코스피 지수는 전 거래일보다 0.8% 오른 2,650선에서 마감했다.",
+    "{name} 관계자는 신규 사업 투자를 확대할 계획이라고 말했다.",
+    "반도체 업황 회복 기대에 관련 종목이 일제히 강세를 보였다.",
+]
+
+
+def legacy_contexts(content, entity_names):
+    """기존 sentiment_server 방식"""
+    contexts = {}
+    for entity_name in entity_names:
+        sentences = content.split('.')
+        relevant_sentences = []
+        for sentence in sentences:
+            if entity_name in sentence:
+                relevant_sentences.append(sentence.strip())
+        if not relevant_sentences:
+            contexts[entity_name] = content[:200]
+        else:
+            contexts[entity_name] = '. '.join(relevant_sentences[:2])
+    return contexts
+
+
+def load_stock_names():
+    with open(STOCK_CSV, encoding="utf-8-sig") as f:
+        return [row["종목명"] for row in csv.DictReader(f) if row.get("종목명")]
+
+
+def make_articles(names, n_articles, n_entities, n_sentences):
+    """종목명을 섞은 합성 기사와 기사별 엔티티 목록 생성"""
+    rng = random.Random(42)
+    articles = []
+    for _ in range(n_articles):
+        entities = rng.sample(names, n_entities)
+        sentences = [rng.choice(FILLER).format(name=rng.choice(entities)) for _ in range(n_sentences)]
+        articles.append((" ".join(sentences), entities))
+    return articles
+
+
+def bench(fn, articles, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content, entities in articles:
+            fn(content, entities)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔티티 문맥 추출 벤치마크")
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--entities", type=int, default=15)
+    parser.add_argument("--sentences", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    articles = make_articles(load_stock_names(), args.articles, args.entities, args.sentences)
+    print(f"기사 {args.articles}건 × 엔티티 {args.entities}개 × 문장 {args.sentences}개")
+
+    legacy = bench(legacy_contexts, articles, args.repeat)
+    current = bench(extract_entity_contexts, articles, args.repeat)
+
+    print(f"기존 방식     : {legacy * 1000:8.1f} ms ({legacy / args.articles * 1e6:7.1f} µs/기사)")
+    print(f"1회 분리 방식 : {current * 1000:8.1f} ms ({current / args.articles * 1e6:7.1f} µs/기사)")
+    print(f"속도 비율     : {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
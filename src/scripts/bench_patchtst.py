@@ -0,0 +1,82 @@
+# src/scripts/bench_patchtst.py
+# PatchTST 30일 예측 벤치마크
+# 기존 sliding_predict 루프(스텝마다 torch.tensor 생성 + np.append로 전체 배열 복사)와
+# model/patchtst.py의 버퍼 기반 추론, direct head(1회 추론)를 합성 종목 데이터로 비교
+#
+# python src/scripts/bench_patchtst.py                            # 2,000 / 20,000 종목
+# python src/scripts/bench_patchtst.py --stocks 5000 --checkpoint model/stock_prediction_model.pth
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import numpy as np
+import torch
+
+from model.patchtst import build_model, load_model, sliding_predict, direct_predict, SEQ_LEN, HORIZON
+
+
+def legacy_sliding_predict(model, input_sequence):
+    """기존 model/stock_prediction.py의 sliding_predict"""
+    window = model.patch_size * model.n_patches
+    predictions_scaled = []
+    for _ in range(HORIZON):
+        X = torch.tensor(input_sequence[:, :window, :], dtype=torch.float32)
+        next_scaled = model(X).detach().numpy()
+        predictions_scaled.append(next_scaled)
+        next_scaled_3d = next_scaled.reshape(-1, 1, 1)
+        input_sequence = np.append(input_sequence[:, 1:, :], next_scaled_3d, axis=1)
+    return predictions_scaled
+
+
+def make_sequences(n_stocks, seed=42):
+    """종목별 랜덤 워크를 0~1로 min-max 스케일한 (n_stocks, 30, 1) 시퀀스"""
+    rng = np.random.default_rng(seed)
+    walks = np.cumsum(rng.normal(0, 1, size=(n_stocks, SEQ_LEN)), axis=1)
+    low, high = walks.min(axis=1, keepdims=True), walks.max(axis=1, keepdims=True)
+    return ((walks - low) / np.maximum(high - low, 1e-6)).reshape(n_stocks, SEQ_LEN, 1)
+
+
+def timed(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PatchTST 30일 예측 벤치마크")
+    parser.add_argument("--stocks", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--checkpoint", help="없으면 무작위 초기화 모델 사용")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, help="torch.set_num_threads")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    torch.manual_seed(0)
+    model = load_model(args.checkpoint) if args.checkpoint else build_model().eval()
+    direct_model = build_model("direct").eval()
+    print(f"torch {torch.__version__}, 스레드 {torch.get_num_threads()}, chunk {args.chunk_size}")
+
+    for n_stocks in args.stocks:
+        sequences = make_sequences(n_stocks)
+        legacy_time, legacy = timed(lambda: legacy_sliding_predict(model, sequences), args.repeat)
+        engine_time, engine = timed(lambda: sliding_predict(model, sequences, chunk_size=args.chunk_size), args.repeat)
+        direct_time, _ = timed(lambda: direct_predict(direct_model, sequences, chunk_size=args.chunk_size), args.repeat)
+
+        legacy = np.asarray(legacy, dtype=np.float32).T  # (30, 종목) -> (종목, 30)
+        max_diff = np.abs(legacy - engine).max()
+        print(f"[{n_stocks:6d} 종목] 기존 {legacy_time * 1000:9.1f} ms | 버퍼 {engine_time * 1000:9.1f} ms"
+              f" | {legacy_time / engine_time:5.2f}x | 최대 오차 {max_diff:.2e}"
+              f" | direct {direct_time * 1000:8.1f} ms ({legacy_time / direct_time:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# src/scripts/bench_stock_matcher.py
+# 종목명 탐색 벤치마크
+# 기존 find_stock_info (df_stock.iterrows() + 종목마다 부분 문자열 검사)와
+# Aho-Corasick 오토마톤 한 번 순회(find_stock_mentions)를 비교
+#
+# python src/scripts/bench_stock_matcher.py                  # data/stock_for_news.csv 종목 + 합성 기사
+# python src/scripts/bench_stock_matcher.py --source db      # tmp_stock 종목 + news_raw 최근 기사
+
+import sys
+import os
+import time
+import random
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import pandas as pd
+
+from model.classify_module import build_stock_matcher, find_stock_mentions, get_stock_data, DB_CONFIG
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+STOCK_CSV = os.path.join(BASE_DIR, "data", "stock_for_news.csv")
+
+SENTENCES = [
+    "{name}는 올해 2분기 영업이익이 전년 대비 12.5% 증가했다고 밝혔다.",
+    "증권가에서는 {name}의 목표주가를 상향 조정했다.",
+    "외국인 투자자들은 이날 {name} 주식을 대거 순매수했다.",
+    "시장 전문가들은 금리 인하 기대감이 반영된 것으로 분석했다.",
+    "코스피 지수는 전 거래일보다 0.8% 오른 2,650선에서 마감했다.",
+    "반도체 업황 회복 기대에 관련 종목이 일제히 강세를 보였다.",
+    "정부는 이날 산업 경쟁력 강화를 위한 지원 방안을 발표했다.",
+]
+
+
+def legacy_find_stock_info(df_stock, title, body):
+    """기존 classify_module.find_stock_info"""
+    combined_text = title + " " + body
+    for _, row in df_stock.iterrows():
+        name = row['stock_name']
+        if name and name in combined_text:
+            return {
+                "종목명": name,
+                "업종명": row["industry_group"] or "",
+                "테마명": (row["themes"] or [])[0] if isinstance(row["themes"], list) and row["themes"] else ""
+            }
+    return None
+
+
+def load_csv_stocks():
+    df = pd.read_csv(STOCK_CSV, dtype=str, encoding="utf-8-sig")
+    return pd.DataFrame({
+        "stock_code": df["종목코드"],
+        "stock_name": df["종목명"],
+        "industry_group": df["업종명"].where(df["업종명"].notna(), None),
+        "themes": [[theme] if isinstance(theme, str) else [] for theme in df["테마명"]],
+    }).drop_duplicates("stock_name")
+
+
+def make_articles(df_stock, n_articles, n_sentences):
+    """종목명 0~3개를 섞은 합성 기사 (약 800~1500자)"""
+    rng = random.Random(42)
+    names = df_stock["stock_name"].dropna().tolist()
+    articles = []
+    for _ in range(n_articles):
+        mentioned = rng.sample(names, rng.randint(0, 3))
+        body = []
+        for _ in range(n_sentences):
+            sentence = rng.choice(SENTENCES)
+            body.append(sentence.format(name=rng.choice(mentioned)) if mentioned and "{name}" in sentence
+                        else sentence.replace("{name}", "한 기업"))
+        articles.append(("증시 동향", " ".join(body)))
+    return articles
+
+
+def load_db_corpus(limit):
+    import psycopg2
+    df_stock = get_stock_data()
+    conn = psycopg2.connect(**DB_CONFIG)
+    with conn.cursor() as cur:
+        cur.execute("SELECT title, content FROM news_raw ORDER BY id DESC LIMIT %s", (limit,))
+        articles = cur.fetchall()
+    conn.close()
+    return df_stock, articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="종목명 탐색 벤치마크")
+    parser.add_argument("--source", choices=["csv", "db"], default="csv")
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=25)
+    args = parser.parse_args()
+
+    if args.source == "db":
+        df_stock, articles = load_db_corpus(args.articles)
+    else:
+        df_stock = load_csv_stocks()
+        articles = make_articles(df_stock, args.articles, args.sentences)
+    print(f"종목 {len(df_stock)}개, 기사 {len(articles)}건")
+
+    start = time.perf_counter()
+    stock_matcher = build_stock_matcher(df_stock)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = [legacy_find_stock_info(df_stock, title, body) for title, body in articles]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mentions = [find_stock_mentions(title + " " + body, stock_matcher) for title, body in articles]
+    matcher_time = time.perf_counter() - start
+
+    # 기존 방식이 찾은 종목이 새 방식 결과에 포함되는지 (더 긴 이름에 가려진 경우 제외)
+    covered = sum(
+        1 for old, found in zip(legacy, mentions)
+        if old is None or any(old["종목명"] in m["종목명"] for m in found)
+    )
+    multi = sum(1 for found in mentions if len(found) > 1)
+
+    print(f"오토마톤 구성 : {build_time * 1000:8.1f} ms (1회)")
+    print(f"iterrows 방식 : {legacy_time * 1000:8.1f} ms ({legacy_time / len(articles) * 1000:6.2f} ms/기사)")
+    print(f"Aho-Corasick  : {matcher_time * 1000:8.1f} ms ({matcher_time / len(articles) * 1000:6.2f} ms/기사)")
+    print(f"속도 비율     : {legacy_time / matcher_time:.1f}x")
+    print(f"기존 결과 포함: {covered}/{len(articles)}건, 2개 이상 종목 탐지: {multi}건")
+
+
+if __name__ == "__main__":
+    main()
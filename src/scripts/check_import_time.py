@@ -0,0 +1,66 @@
+# src/scripts/check_import_time.py
+# model.classify_module import 시간 예산 검사
+# 새 인터프리터에서 모듈을 import해 걸린 시간을 재고, 예산을 넘거나
+# 무거운 라이브러리(torch, transformers, Gemini, DB 드라이버 등)가 import 시점에 로딩되면 실패(exit 1)
+#
+# python src/scripts/check_import_time.py --budget-ms 300
+
+import sys
+import os
+import json
+import argparse
+import subprocess
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+# import만으로는 로딩되면 안 되는 모듈
+HEAVY_MODULES = ["torch", "transformers", "google.generativeai", "psycopg2", "pandas", "joblib", "sklearn"]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(module, runs):
+    """새 프로세스에서 import 시간을 runs번 측정해 최소값 반환"""
+    best, loaded = None, []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        best = result["elapsed"] if best is None else min(best, result["elapsed"])
+        loaded = result["loaded"]
+    return best, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import 시간 예산 검사")
+    parser.add_argument("--module", default="model.classify_module")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "300")))
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    elapsed, loaded = measure(args.module, args.runs)
+    print(f"{args.module} import: {elapsed * 1000:.1f} ms (예산 {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if elapsed * 1000 > args.budget_ms:
+        print("❌ import 시간 예산 초과")
+        failed = True
+    if loaded:
+        print(f"❌ import 시점에 무거운 모듈 로딩됨: {', '.join(loaded)}")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✅ import 시간 예산 통과")
+
+
+if __name__ == "__main__":
+    main()
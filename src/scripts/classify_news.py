@@ -1,13 +1,29 @@
 # /src/scripts/classify_news.py
+# 미분류 뉴스 분류 워커
+# 각 워커는 news_classification_claim 테이블에 기사 묶음을 선점(SELECT ... FOR NO KEY UPDATE SKIP LOCKED)한 뒤 처리하므로
+# 여러 프로세스/호스트에서 동시에 실행해도 같은 기사를 중복 처리하지 않음
+# 워커가 비정상 종료하면 선점은 CLASSIFY_CLAIM_TTL초 후 만료되어 다른 워커가 다시 가져감
+#
+# python src/scripts/classify_news.py               # 워커 1개 (CLASSIFY_WORKERS)
+# python src/scripts/classify_news.py --workers 4   # 이 호스트에서 워커 4개, LLM 한도는 워커 수로 나눔
+# python src/scripts/classify_news.py --workers 4 --hosts 3   # 3개 호스트에서 실행, 한도는 3 x 4 워커로 나눔
+#
+# LLM_RPM/LLM_TPM은 API 키 전체 한도이고 워커마다 (호스트 수 x 호스트당 워커 수)로 나눠 씀
+# 여러 호스트에서 같은 키를 쓰면 모든 호스트에 같은 --hosts(CLASSIFY_HOSTS)를 지정해야 전체 한도를 넘지 않음
 
 import sys
 import os
 import time
+import signal
+import socket
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
 import psycopg2
-import pandas as pd
-from model.classify_module import predict_categories_with_representatives, clean_text
+from psycopg2.extras import execute_values
+from model.classify_module import predict_categories_for_batch, generate_representatives, warmup
 import joblib
 from dotenv import load_dotenv
 from datetime import datetime
@@ -23,60 +39,217 @@ DB_CONFIG = {
     "dbname": os.getenv("DB_NAME"),
 }
 
-def load_unclassified_news(conn):
+# 한 번에 선점/임베딩/분류할 기사 수
+CLASSIFY_BATCH_SIZE = int(os.getenv("CLASSIFY_BATCH_SIZE", "256"))
+# 동시에 대표 키워드를 생성할 기사 수 (실제 호출 속도는 LLM 클라이언트의 RPM/TPM 제한이 결정)
+LLM_WORKERS = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+# 선점 유효 시간(초), 처리 중에는 CLAIM_TTL/3 간격으로 연장
+CLAIM_TTL = int(os.getenv("CLASSIFY_CLAIM_TTL", "600"))
+
+CLAIM_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS news_classification_claim (
+    news_id INTEGER PRIMARY KEY REFERENCES news_raw(id) ON DELETE CASCADE,
+    worker_id TEXT NOT NULL,
+    claimed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_news_classification_claim_worker ON news_classification_claim (worker_id);
+"""
+
+def ensure_claim_table(conn):
+    with conn.cursor() as cur:
+        cur.execute(CLAIM_TABLE_SQL)
+    conn.commit()
+
+def claim_news(conn, worker_id, chunk_size, after_id=0):
+    """
+    분류 결과도 유효한 선점도 없는 뉴스를 id 순서로 최대 chunk_size개 선점
+    반환: (선점한 (id, title, content) 목록, 이번에 찾은 후보 중 가장 큰 id 또는 None)
+    - 다른 워커가 선점 중인 행은 SKIP LOCKED로 건너뜀
+    - 만료된 선점은 ON CONFLICT로 넘겨받고, 동시에 커밋된 선점과 겹치면 선점 목록에서 빠짐
+      (후보는 있었지만 모두 다른 워커가 가져간 경우에도 마지막 후보 id를 반환해 호출한 쪽이 다음 페이지로 진행)
+    """
     query = """
-    SELECT id, title, content
-    FROM news_raw
-    WHERE id NOT IN (
-        SELECT DISTINCT news_id FROM news_classification
+    WITH candidates AS (
+        SELECT r.id
+        FROM news_raw r
+        WHERE r.id > %(after_id)s
+          AND NOT EXISTS (SELECT 1 FROM news_classification c WHERE c.news_id = r.id)
+          AND NOT EXISTS (
+            SELECT 1 FROM news_classification_claim k
+            WHERE k.news_id = r.id AND k.expires_at > now()
+          )
+        ORDER BY r.id
+        LIMIT %(limit)s
+        FOR NO KEY UPDATE OF r SKIP LOCKED
+    ), claimed AS (
+        INSERT INTO news_classification_claim (news_id, worker_id, claimed_at, expires_at)
+        SELECT id, %(worker_id)s, now(), now() + %(ttl)s * interval '1 second' FROM candidates
+        ON CONFLICT (news_id) DO UPDATE
+            SET worker_id = EXCLUDED.worker_id, claimed_at = EXCLUDED.claimed_at, expires_at = EXCLUDED.expires_at
+            WHERE news_classification_claim.expires_at <= now()
+        RETURNING news_id
     )
-    ORDER BY id
+    SELECT r.id, r.title, r.content, claimed.news_id IS NOT NULL
+    FROM candidates
+    JOIN news_raw r ON r.id = candidates.id
+    LEFT JOIN claimed ON claimed.news_id = candidates.id
+    ORDER BY r.id
     """
-    return pd.read_sql(query, conn)
+    with conn.cursor() as cur:
+        cur.execute(query, {"after_id": after_id, "limit": chunk_size, "worker_id": worker_id, "ttl": CLAIM_TTL})
+        rows = cur.fetchall()
+    conn.commit()
+    last_id = rows[-1][0] if rows else None
+    return [(news_id, title, content) for news_id, title, content, claimed in rows if claimed], last_id
+
+def extend_claims(conn, worker_id, news_ids):
+    with conn.cursor() as cur:
+        cur.execute("""
+            UPDATE news_classification_claim
+            SET expires_at = now() + %s * interval '1 second'
+            WHERE worker_id = %s AND news_id = ANY(%s)
+        """, (CLAIM_TTL, worker_id, list(news_ids)))
+    conn.commit()
+
+def release_claims(conn, worker_id, news_ids=None):
+    """선점 해제 (news_ids가 None이면 이 워커의 선점 전체), 커밋은 호출한 쪽에서"""
+    with conn.cursor() as cur:
+        if news_ids is None:
+            cur.execute("DELETE FROM news_classification_claim WHERE worker_id = %s", (worker_id,))
+        else:
+            cur.execute("DELETE FROM news_classification_claim WHERE worker_id = %s AND news_id = ANY(%s)",
+                        (worker_id, list(news_ids)))
 
-def insert_classification(conn, news_id, category, representative):
+def iter_claimed_news(conn, worker_id, chunk_size):
+    """
+    선점한 뉴스를 청크 단위로 반환 (keyset 페이지)
+    끝에 닿으면 처음부터 한 번 더 훑어서 만료된 선점이나 늦게 들어온 낮은 id를 처리
+    """
+    after_id = 0
+    rescanned = False
+    while True:
+        rows, last_id = claim_news(conn, worker_id, chunk_size, after_id)
+        if last_id is not None:
+            # 후보를 찾았으면 모두 다른 워커에게 뺏겼더라도 끝이 아니므로 다음 페이지로 진행
+            rescanned = False
+            if rows:
+                yield rows
+            after_id = last_id
+            continue
+        if after_id == 0 or rescanned:
+            return
+        after_id, rescanned = 0, True
+
+def insert_classifications(conn, rows):
+    """(news_id, category, representative) 목록을 한 번에 저장"""
     query = """
     INSERT INTO news_classification (news_id, category, representative, classified_at)
-    VALUES (%s, %s, %s, %s)
+    VALUES %s
     ON CONFLICT (news_id, category) DO NOTHING
     """
     now = datetime.now()
     with conn.cursor() as cur:
-        cur.execute(query, (news_id, category, representative, now))
+        execute_values(cur, query, [(news_id, category, representative, now) for news_id, category, representative in rows])
 
-def main():
-    print("뉴스 분류 시작", flush=True)
+def run_worker(worker_id):
+    # 스케줄러/다른 워커가 보낸 SIGTERM에도 선점을 해제하고 종료
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(1))
+    print(f"[{worker_id}] 뉴스 분류 시작", flush=True)
+
+    # 분류기/임베딩 모델/Gemini/종목 데이터 미리 로딩
+    print(f"[{worker_id}] 리소스 로딩 완료: {warmup()}", flush=True)
 
     # DB 연결
     conn = psycopg2.connect(**DB_CONFIG)
-
-    # 분류할 뉴스 로드
-    df = load_unclassified_news(conn)
-    print(f"총 {len(df)}건의 뉴스 로드됨", flush=True)
-
+    executor = ThreadPoolExecutor(max_workers=LLM_WORKERS)
     count = 0
-    for _, row in df.iterrows():
-        news_id = row['id']
-        title = row['title']
-        content = row['content']
-
-        predictions = predict_categories_with_representatives(title, content)
-
-        for pred in predictions:
-            category = pred['category']
-            representative = pred['representative']
-            insert_classification(conn, news_id, category, representative)
-
-        conn.commit()
-        count += 1
-
-        print(f"{count}건 처리됨 (id={news_id})", flush=True)
+    try:
+        for chunk in iter_claimed_news(conn, worker_id, CLASSIFY_BATCH_SIZE):
+            news_ids = [row[0] for row in chunk]
+
+            # 1단계: 청크 전체 임베딩 + 카테고리 분류
+            batch_predictions = predict_categories_for_batch((title, content) for _, title, content in chunk)
+            print(f"[{worker_id}] {len(chunk)}건 분류 완료 (id {news_ids[0]}~{news_ids[-1]}), 대표 키워드 생성 시작", flush=True)
+
+            # 2단계: 기사별 LLM 대표 키워드를 동시에 생성, 오래 걸리면 선점 연장
+            rows = []
+            extended_at = time.monotonic()
+            for news_id, predictions in zip(news_ids, executor.map(generate_representatives, batch_predictions)):
+                rows.extend((news_id, pred['category'], pred['representative']) for pred in predictions)
+                if time.monotonic() - extended_at > CLAIM_TTL / 3:
+                    extend_claims(conn, worker_id, news_ids)
+                    extended_at = time.monotonic()
+
+            # 3단계: 결과 저장과 선점 해제를 한 트랜잭션으로 커밋
+            insert_classifications(conn, rows)
+            release_claims(conn, worker_id, news_ids)
+            conn.commit()
+            count += len(chunk)
+            print(f"[{worker_id}] {count}건 처리됨 (마지막 id={news_ids[-1]})", flush=True)
+    finally:
+        # 처리 못 한 선점은 바로 돌려줌 (프로세스가 강제 종료되면 만료 시간이 지나 회수됨)
+        executor.shutdown(wait=False, cancel_futures=True)
+        try:
+            conn.rollback()
+            release_claims(conn, worker_id)
+            conn.commit()
+        except psycopg2.Error as e:
+            print(f"[{worker_id}] 선점 해제 실패 (만료 후 회수됨): {e}", flush=True)
+        conn.close()
+
+    print(f"[{worker_id}] 모든 분류 결과 저장 완료 ({count}건)", flush=True)
+
+def share_llm_quota(workers, hosts=1):
+    """
+    모든 호스트의 워커들이 LLM 분당 한도를 나눠 쓰도록 환경변수 조정 (자식 프로세스가 상속)
+    다른 호스트의 워커 수는 알 수 없으므로 hosts는 호출한 쪽에서 지정 (호스트마다 워커 수가 같다고 가정)
+    """
+    for name, default in (("LLM_RPM", "15"), ("LLM_TPM", "1000000")):
+        total = int(os.getenv(name, default))
+        if total:
+            os.environ[name] = str(max(1, total // (workers * hosts)))
 
-        # 1분에 15개 이하 처리 (4초 간격)
-        time.sleep(4)
+def main():
+    parser = argparse.ArgumentParser(description="미분류 뉴스 분류 워커")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("CLASSIFY_WORKERS", "1")),
+                        help="이 호스트에서 실행할 워커 프로세스 수")
+    parser.add_argument("--hosts", type=int, default=int(os.getenv("CLASSIFY_HOSTS", "1")),
+                        help="같은 LLM API 키로 워커를 실행하는 호스트 수 (LLM 한도를 나눌 때 사용)")
+    args = parser.parse_args()
 
+    conn = psycopg2.connect(**DB_CONFIG)
+    ensure_claim_table(conn)
     conn.close()
-    print("모든 분류 결과 저장 완료", flush=True)
+
+    host = socket.gethostname()
+    share_llm_quota(max(1, args.workers), max(1, args.hosts))
+    if args.workers <= 1:
+        run_worker(f"{host}:{os.getpid()}")
+        return
+
+    # torch/이벤트 루프 스레드 상태를 물려받지 않도록 spawn
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(f"{host}:{os.getpid()}-{i}",), name=f"classify-worker-{i}")
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+    failed = [process.name for process in processes if process.exitcode != 0]
+    if failed:
+        print(f"❌ 비정상 종료한 워커: {', '.join(failed)}", flush=True)
+        sys.exit(1)
+    print("모든 워커 종료", flush=True)
 
 if __name__ == "__main__":
     main()
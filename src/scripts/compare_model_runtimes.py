@@ -0,0 +1,122 @@
+# src/scripts/compare_model_runtimes.py
+# 모델 런타임 백엔드(eager / int8 / onnx) 정확도-지연시간 비교
+# eager 결과를 기준으로 각 백엔드의 출력 일치도와 배치당 지연시간을 측정
+#
+# python src/scripts/compare_model_runtimes.py --component sentiment --backends eager int8 onnx
+# python src/scripts/compare_model_runtimes.py --component classifier --input texts.txt
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import numpy as np
+import torch
+import psycopg2
+from dotenv import load_dotenv
+
+from model.model_runtime import load_hf_model, BACKENDS
+
+# component -> (모델명, task)
+COMPONENTS = {
+    "sentiment": ("krevas/finance-koelectra-small-discriminator", "sequence-classification"),
+    "classifier": ("klue/roberta-small", "feature-extraction"),
+    "ner": ("KPF/KPF-bert-ner", "token-classification"),
+}
+
+load_dotenv()
+
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST"),
+    "port": os.getenv("DB_PORT"),
+    "user": os.getenv("DB_USER"),
+    "password": os.getenv("DB_PASSWORD"),
+    "dbname": os.getenv("DB_NAME"),
+}
+
+
+def load_texts(input_path, limit):
+    """입력 파일(한 줄에 텍스트 하나) 또는 DB의 최근 뉴스 본문"""
+    if input_path:
+        with open(input_path, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()][:limit]
+    conn = psycopg2.connect(**DB_CONFIG)
+    with conn.cursor() as cur:
+        cur.execute("SELECT title || ' ' || content FROM news_raw ORDER BY id DESC LIMIT %s", (limit,))
+        texts = [row[0] for row in cur.fetchall()]
+    conn.close()
+    return texts
+
+
+def run_backend(model_name, task, backend, texts, batch_size, max_length):
+    """백엔드별 출력(numpy)과 배치당 지연시간 목록 반환"""
+    tokenizer, model, _ = load_hf_model(model_name, task, backend=backend)
+    outputs, latencies = [], []
+
+    for i in range(0, len(texts), batch_size):
+        inputs = tokenizer(texts[i:i + batch_size], return_tensors="pt", padding=True,
+                           truncation=True, max_length=max_length)
+        start = time.perf_counter()
+        with torch.inference_mode():
+            result = model(**inputs)
+        latencies.append(time.perf_counter() - start)
+
+        if task == "feature-extraction":
+            # classify_module.embed_text와 같은 mean pooling (attention mask로 패딩 제외)
+            mask = inputs["attention_mask"].unsqueeze(-1).to(result.last_hidden_state.dtype)
+            pooled = (result.last_hidden_state * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            outputs.append(pooled.numpy())
+        elif task == "sequence-classification":
+            outputs.append(torch.softmax(result.logits, dim=-1).numpy())
+        else:
+            mask = inputs["attention_mask"].bool()
+            outputs.append(result.logits.argmax(dim=-1)[mask].numpy())
+
+    return np.concatenate(outputs), latencies
+
+
+def agreement(task, reference, candidate):
+    """eager 대비 출력 일치도"""
+    if task == "feature-extraction":
+        cosine = (reference * candidate).sum(axis=1) / (
+            np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1) + 1e-12)
+        return f"평균 코사인 유사도 {cosine.mean():.4f} (최소 {cosine.min():.4f})"
+    if task == "sequence-classification":
+        same_label = (reference.argmax(axis=1) == candidate.argmax(axis=1)).mean()
+        max_diff = np.abs(reference - candidate).max()
+        return f"라벨 일치율 {same_label * 100:.1f}%, 확률 최대 오차 {max_diff:.4f}"
+    return f"토큰 태그 일치율 {(reference == candidate).mean() * 100:.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 런타임 백엔드 비교")
+    parser.add_argument("--component", choices=COMPONENTS, default="sentiment")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--input", help="한 줄에 텍스트 하나인 파일 (없으면 DB 뉴스 사용)")
+    parser.add_argument("--limit", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-length", type=int, default=256)
+    args = parser.parse_args()
+
+    model_name, task = COMPONENTS[args.component]
+    texts = load_texts(args.input, args.limit)
+    print(f"{model_name} ({task}) - 텍스트 {len(texts)}개, 배치 {args.batch_size}")
+
+    # 항상 eager를 기준으로 먼저 실행
+    backends = ["eager"] + [backend for backend in args.backends if backend != "eager"]
+    reference = None
+    for backend in backends:
+        outputs, latencies = run_backend(model_name, task, backend, texts, args.batch_size, args.max_length)
+        # 첫 배치는 워밍업으로 제외
+        measured = latencies[1:] or latencies
+        line = f"[{backend:5}] 배치당 {np.mean(measured) * 1000:8.1f} ms (p95 {np.percentile(measured, 95) * 1000:8.1f} ms)"
+        if reference is None:
+            reference = outputs
+            print(f"{line} | 기준")
+        else:
+            print(f"{line} | {agreement(task, reference, outputs)}")
+
+
+if __name__ == "__main__":
+    main()
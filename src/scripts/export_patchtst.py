@@ -0,0 +1,75 @@
+# src/scripts/export_patchtst.py
+# PatchTST 체크포인트를 TorchScript/ONNX 엔진으로 내보내고 eager 모델과 출력 일치 여부 검사
+# 합성 종목 시퀀스로 두 예측기의 30일 예측을 비교해 최대 오차가 허용치를 넘으면 실패(exit 1)
+# 내보낸 파일은 PREDICTION_CHECKPOINT로 model/stock_prediction.py에 지정
+#
+# python src/scripts/export_patchtst.py --output model/stock_prediction_model.pt
+# python src/scripts/export_patchtst.py --output model/stock_prediction_model.onnx --threads 2
+# python src/scripts/export_patchtst.py --output model/stock_prediction_model.onnx --check-only
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import numpy as np
+
+from model.patchtst import load_checkpoint, predict, SEQ_LEN
+from model.patchtst_engine import export_model, PatchTSTEngine, FORMATS
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+
+def make_sequences(n_stocks, seed=0):
+    """종목별 랜덤 워크를 0~1로 min-max 스케일한 (n_stocks, 30) 시퀀스"""
+    rng = np.random.default_rng(seed)
+    walks = np.cumsum(rng.normal(0, 1, size=(n_stocks, SEQ_LEN)), axis=1)
+    low, high = walks.min(axis=1, keepdims=True), walks.max(axis=1, keepdims=True)
+    return ((walks - low) / np.maximum(high - low, 1e-6)).astype(np.float32)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PatchTST TorchScript/ONNX 내보내기 + 출력 일치 검사")
+    parser.add_argument("--checkpoint", default=os.path.join(BASE_DIR, "model", "stock_prediction_model.pth"))
+    parser.add_argument("--output", required=True, help=".pt/.ts(TorchScript) 또는 .onnx")
+    parser.add_argument("--format", choices=FORMATS, help="없으면 확장자로 결정")
+    parser.add_argument("--threads", type=int, default=0, help="엔진 연산 내부 스레드 수 (0: 기본값)")
+    parser.add_argument("--inter-threads", type=int, default=0, help="엔진 연산 간 스레드 수 (0: 기본값)")
+    parser.add_argument("--stocks", type=int, default=2000, help="일치 검사에 쓸 합성 종목 수 (1종목 배치도 함께 검사)")
+    parser.add_argument("--atol", type=float, default=1e-4)
+    parser.add_argument("--check-only", action="store_true", help="내보내지 않고 기존 파일만 검사")
+    args = parser.parse_args()
+
+    if not args.check_only:
+        fmt, metadata = export_model(args.checkpoint, args.output, args.format)
+        print(f"✅ {fmt} 내보내기 완료: {args.output} ({metadata.get('head')} head)")
+
+    load_time, (model, _) = timed(lambda: load_checkpoint(args.checkpoint))
+    engine_load_time, engine = timed(lambda: PatchTSTEngine(args.output, args.threads, args.inter_threads))
+    print(f"로딩: eager {load_time * 1000:.1f} ms | 엔진 {engine_load_time * 1000:.1f} ms")
+
+    failed = False
+    # 배치 크기가 바뀌어도(가변 배치 차원) 같은 결과인지 1종목과 여러 종목으로 검사
+    for n_stocks in (1, args.stocks):
+        sequences = make_sequences(n_stocks)
+        eager_time, expected = timed(lambda: predict(model, sequences))
+        engine_time, actual = timed(lambda: predict(engine, sequences))
+        max_diff = float(np.abs(expected - actual).max())
+        ok = max_diff <= args.atol
+        failed |= not ok
+        print(f"{'✅' if ok else '❌'} [{n_stocks:6d} 종목] 최대 오차 {max_diff:.2e} (허용 {args.atol:.0e})"
+              f" | eager {eager_time * 1000:8.1f} ms | 엔진 {engine_time * 1000:8.1f} ms")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
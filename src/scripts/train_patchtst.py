@@ -0,0 +1,144 @@
+# src/scripts/train_patchtst.py
+# PatchTST 학습/체크포인트 저장
+# 종목별 일별 종가 이력에서 (30일 입력, 다음 30일) 구간을 만들고, 입력 30일의 min/max로 스케일해 학습
+# (stock_close_sequence_scaled와 같은 스케일 방식)
+# - direct: 30일을 한 번에 예측하는 head
+# - autoregressive: 기존 추론 루프용 1일 예측 head (추론과 같이 입력 앞쪽 28일로 31일째를 예측)
+# 저장한 체크포인트는 PREDICTION_CHECKPOINT로 model/stock_prediction.py에 지정
+#
+# python src/scripts/train_patchtst.py --head direct --output model/stock_prediction_model_direct.pth
+# python src/scripts/train_patchtst.py --input closes.csv     # code,date,close 열을 가진 CSV
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+from dotenv import load_dotenv
+
+from model.patchtst import build_model, model_inputs, save_checkpoint, HEADS, SEQ_LEN, HORIZON
+
+load_dotenv()
+
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST"),
+    "port": os.getenv("DB_PORT"),
+    "user": os.getenv("DB_USER"),
+    "password": os.getenv("DB_PASSWORD"),
+    "dbname": os.getenv("DB_NAME"),
+}
+
+
+def load_closes(input_path):
+    """종목별 날짜순 종가 목록 (CSV 또는 stock_data 테이블)"""
+    if input_path:
+        df = pd.read_csv(input_path, dtype={"code": str})
+    else:
+        import psycopg2
+        conn = psycopg2.connect(**DB_CONFIG)
+        df = pd.read_sql("SELECT code, date, close FROM stock_data WHERE close IS NOT NULL", conn)
+        conn.close()
+    df = df.dropna(subset=["close"]).sort_values(["code", "date"])
+    return [group["close"].astype(float).to_numpy() for _, group in df.groupby("code")]
+
+
+def make_windows(series_list, stride, val_ratio):
+    """
+    (입력 30일, 다음 30일) 구간을 입력 구간 min/max로 스케일
+    종목마다 뒤쪽 val_ratio 비율의 구간을 검증용으로 분리 (시간 순서 유지)
+    """
+    offsets = np.arange(SEQ_LEN + HORIZON)
+    train, val = [], []
+    for closes in series_list:
+        count = len(closes) - SEQ_LEN - HORIZON + 1
+        if count <= 0:
+            continue
+        windows = closes[np.arange(0, count, stride)[:, None] + offsets]
+        low = windows[:, :SEQ_LEN].min(axis=1, keepdims=True)
+        high = windows[:, :SEQ_LEN].max(axis=1, keepdims=True)
+        scaled = ((windows - low) / np.maximum(high - low, 1e-6)).astype(np.float32)
+        split = int(len(scaled) * (1 - val_ratio))
+        train.append(scaled[:split])
+        val.append(scaled[split:])
+    empty = np.empty((0, SEQ_LEN + HORIZON), dtype=np.float32)
+    return (np.concatenate(train) if train else empty), (np.concatenate(val) if val else empty)
+
+
+def split_xy(model, windows):
+    inputs = model_inputs(model, windows[:, :SEQ_LEN])
+    targets = windows[:, SEQ_LEN:] if model.head == "direct" else windows[:, SEQ_LEN]
+    return torch.from_numpy(np.ascontiguousarray(inputs)).unsqueeze(-1), torch.from_numpy(np.ascontiguousarray(targets))
+
+
+def evaluate(model, inputs, targets, batch_size, loss_fn):
+    if len(inputs) == 0:
+        return float("nan")
+    model.eval()
+    total = 0.0
+    with torch.inference_mode():
+        for start in range(0, len(inputs), batch_size):
+            x, y = inputs[start:start + batch_size], targets[start:start + batch_size]
+            total += loss_fn(model(x).reshape(y.shape), y).item() * len(x)
+    return total / len(inputs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PatchTST 학습")
+    parser.add_argument("--head", choices=HEADS, default="direct")
+    parser.add_argument("--input", help="code,date,close 열을 가진 CSV (없으면 DB stock_data)")
+    parser.add_argument("--output", default=os.path.join("model", "stock_prediction_model_direct.pth"))
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--lr", type=float, default=0.001)
+    parser.add_argument("--stride", type=int, default=1, help="학습 구간 간격(일)")
+    parser.add_argument("--val-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    torch.manual_seed(args.seed)
+    model = build_model(args.head)
+    train_windows, val_windows = make_windows(load_closes(args.input), args.stride, args.val_ratio)
+    if len(train_windows) == 0:
+        print(f"❌ 학습 구간 없음 (종목별 종가가 {SEQ_LEN + HORIZON}일 이상 필요)")
+        sys.exit(1)
+    train_x, train_y = split_xy(model, train_windows)
+    val_x, val_y = split_xy(model, val_windows)
+    print(f"✅ {args.head} head 학습 구간 {len(train_x)}개, 검증 구간 {len(val_x)}개")
+
+    optimizer = torch.optim.Adam(model.parameters(), lr=args.lr)
+    loss_fn = nn.MSELoss()
+    best_loss, best_state = None, None
+    for epoch in range(1, args.epochs + 1):
+        start = time.perf_counter()
+        model.train()
+        order = torch.randperm(len(train_x))
+        for i in range(0, len(order), args.batch_size):
+            idx = order[i:i + args.batch_size]
+            optimizer.zero_grad()
+            loss = loss_fn(model(train_x[idx]).reshape(train_y[idx].shape), train_y[idx])
+            loss.backward()
+            optimizer.step()
+
+        train_loss = evaluate(model, train_x, train_y, 4096, loss_fn)
+        val_loss = evaluate(model, val_x, val_y, 4096, loss_fn)
+        print(f"epoch {epoch:3d} | train {train_loss:.6f} | val {val_loss:.6f} | {time.perf_counter() - start:.1f}s", flush=True)
+
+        # 검증 손실이 가장 낮은 가중치 보관 (검증 구간이 없으면 학습 손실 기준)
+        score = val_loss if len(val_x) else train_loss
+        if best_loss is None or score < best_loss:
+            best_loss = score
+            best_state = {key: value.detach().clone() for key, value in model.state_dict().items()}
+
+    model.load_state_dict(best_state)
+    save_checkpoint(args.output, model, val_loss=best_loss, epochs=args.epochs, train_samples=len(train_x),
+                    val_samples=len(val_x), source=args.input or "stock_data")
+    print(f"✅ 체크포인트 저장: {args.output} (손실 {best_loss:.6f})")
+
+
+if __name__ == "__main__":
+    main()
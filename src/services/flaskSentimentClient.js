@@ -1,4 +1,5 @@
 const axios = require('axios');
+const { Readable } = require('stream');
 
 class FlaskSentimentClient {
     constructor() {
@@ -110,6 +111,74 @@ class FlaskSentimentClient {
         }
     }
 
+    /**
+     * 📦 대량 감정분석 (NDJSON 스트리밍, 연결 하나로 여러 기사 처리)
+     * @param {Iterable|AsyncIterable} articles - { id, content, entities } 기사 목록 (제너레이터 가능)
+     * @param {Function} onResult - 기사별 결과 콜백 ({ id, success, results, rawResults, error })
+     * @param {number} confidenceThreshold
+     * @returns {Promise<Object>} 처리 통계
+     */
+    async analyzeBulk(articles, onResult, confidenceThreshold = 55) {
+        const startTime = Date.now();
+        const body = Readable.from((async function* () {
+            for await (const article of articles) {
+                yield JSON.stringify(article) + '\n';
+            }
+        })());
+
+        const response = await this.client.post('/analyze/bulk', body, {
+            headers: { 'Content-Type': 'application/x-ndjson', 'Accept': 'application/x-ndjson' },
+            responseType: 'stream',
+            timeout: 0  // 대량 처리는 전체 시간 제한 없음
+        });
+        response.data.setEncoding('utf8');
+
+        let buffer = '';
+        let processed = 0;
+        let failed = 0;
+
+        const handleLine = async (line) => {
+            if (!line.trim()) return;
+            const output = JSON.parse(line);
+            processed++;
+            if (!output.success) {
+                failed++;
+                await onResult({ id: output.id, success: false, error: output.error, results: [] });
+                return;
+            }
+            // 🎯 Confidence threshold 적용
+            const filteredResults = output.results.filter(result =>
+                result.confidence_score >= confidenceThreshold
+            );
+            await onResult({ id: output.id, success: true, results: filteredResults, rawResults: output.results });
+        };
+
+        for await (const chunk of response.data) {
+            buffer += chunk;
+            let newline;
+            while ((newline = buffer.indexOf('\n')) !== -1) {
+                const line = buffer.slice(0, newline);
+                buffer = buffer.slice(newline + 1);
+                await handleLine(line);
+            }
+        }
+        await handleLine(buffer);
+
+        const processingTime = Date.now() - startTime;
+        console.log(`✅ 대량 분석 완료: ${processed}건 (실패 ${failed}건, ${processingTime}ms)`);
+
+        return {
+            success: true,
+            stats: {
+                totalArticles: processed,
+                failedCount: failed,
+                processingTimeMs: processingTime,
+                confidenceThreshold: confidenceThreshold,
+                timestamp: new Date().toISOString()
+            }
+        };
+    }
+
     /**
      * 단일 엔티티 감정분석
      * @param {string} entityName - 엔티티 명
@@ -1,15 +1,18 @@
 # src/utils/ner_extractor.py
 import sys
+import os
 import json
-from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
+from transformers import pipeline
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from model.model_runtime import load_hf_model
 
 # 1. 입력
 text = sys.stdin.read()
 
 # 2. 모델 로드
 model_name = "KPF/KPF-bert-ner"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModelForTokenClassification.from_pretrained(model_name)
+# 백엔드(eager/int8/onnx)는 MODEL_BACKEND_NER 또는 MODEL_BACKEND로 선택
+tokenizer, model, _ = load_hf_model(model_name, "token-classification", component="ner")
 
 # 3. pipeline 생성
 ner = pipeline(